@@ -0,0 +1,247 @@
+# ingest.py - Streaming bulk roster ingest (CSV / JSONL / Parquet)
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from datetime import date
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Compact row layout shared with the server-side PersonnelStore
+ROW_FIELDS = ('id', 'name', 'skills', 'experience', 'personality', 'mbtiType',
+              'experienceYears', 'availability', 'hourlyRate', 'allocations')
+FORMATS = ('csv', 'jsonl', 'parquet')
+SKILL_SEPARATORS = (';', '|')
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def _required_str(raw: Dict[str, Any], field: str) -> str:
+    value = raw.get(field)
+    if value is None or value == '':
+        raise ValueError(f"{field} is required")
+    if not isinstance(value, str):
+        raise ValueError(f"{field} must be a string")
+    return value
+
+
+def _parse_skills(value: Any) -> Tuple[str, ...]:
+    if isinstance(value, str):
+        # CSV cells carry skills as "Python;React" or "Python|React"
+        for separator in SKILL_SEPARATORS:
+            if separator in value:
+                return tuple(skill.strip() for skill in value.split(separator) if skill.strip())
+        return (value.strip(),) if value.strip() else ()
+    if isinstance(value, (list, tuple)):
+        if not all(isinstance(skill, str) for skill in value):
+            raise ValueError("skills must be strings")
+        return tuple(value)
+    raise ValueError("skills is required")
+
+
+def _parse_date(value: Any, field: str) -> date:
+    if isinstance(value, date):
+        return value
+    if not isinstance(value, str):
+        raise ValueError(f"allocation {field} is required")
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"allocation {field} must be an ISO date")
+
+
+def _parse_allocation(value: Any) -> Dict[str, Any]:
+    """Validate one allocation entry against the server's Allocation model"""
+    if not isinstance(value, dict):
+        raise ValueError("allocations must be objects")
+    project_name = value.get('projectName')
+    if not isinstance(project_name, str) or not project_name:
+        raise ValueError("allocation projectName is required")
+    start_date = _parse_date(value.get('startDate'), 'startDate')
+    end_date = _parse_date(value.get('endDate'), 'endDate')
+    if end_date < start_date:
+        raise ValueError("allocation endDate must not be before startDate")
+    fraction = value.get('fraction', 1.0)
+    if isinstance(fraction, bool) or not isinstance(fraction, (int, float)):
+        raise ValueError("allocation fraction must be a number")
+    if not 0.0 <= fraction <= 1.0:
+        raise ValueError("allocation fraction must be between 0 and 1")
+    return {'projectName': project_name, 'startDate': start_date, 'endDate': end_date, 'fraction': float(fraction)}
+
+
+def validate_row(raw: Dict[str, Any]) -> tuple:
+    """Fast-path validation of one roster row into the compact ROW_FIELDS tuple"""
+    row_id = raw.get('id')
+    if row_id in (None, ''):
+        row_id = None
+    else:
+        try:
+            row_id = int(row_id)
+        except (TypeError, ValueError):
+            raise ValueError("id must be an integer")
+
+    years = raw.get('experienceYears')
+    if years is None or years == '':
+        raise ValueError("experienceYears is required")
+    try:
+        years = int(years)
+    except (TypeError, ValueError):
+        raise ValueError("experienceYears must be an integer")
+
+    rate = raw.get('hourlyRate')
+    if rate in (None, ''):
+        rate = 0.0
+    else:
+        try:
+            rate = float(rate)
+        except (TypeError, ValueError):
+            raise ValueError("hourlyRate must be a number")
+
+    allocations = raw.get('allocations') or ()
+    if not isinstance(allocations, (list, tuple)):
+        raise ValueError("allocations must be a list")
+
+    mbti_type = raw.get('mbtiType') or None
+    if mbti_type is not None and not isinstance(mbti_type, str):
+        raise ValueError("mbtiType must be a string")
+    availability = raw.get('availability') or 'full-time'
+    if not isinstance(availability, str):
+        raise ValueError("availability must be a string")
+
+    return (
+        row_id,
+        _required_str(raw, 'name'),
+        _parse_skills(raw.get('skills')),
+        _required_str(raw, 'experience'),
+        _required_str(raw, 'personality'),
+        mbti_type,
+        years,
+        availability,
+        rate,
+        tuple(_parse_allocation(allocation) for allocation in allocations)
+    )
+
+
+def detect_format(path: str) -> str:
+    """Infer the ingest format from a file extension"""
+    extension = os.path.splitext(path)[1].lower().lstrip('.')
+    if extension in ('ndjson', 'json'):
+        return 'jsonl'
+    if extension in ('parq', 'pq'):
+        return 'parquet'
+    if extension not in FORMATS:
+        raise ValueError(f"Cannot infer ingest format from '{path}', expected one of {', '.join(FORMATS)}")
+    return extension
+
+
+def iter_raw_chunks(stream: io.BufferedIOBase, fmt: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[Dict[str, Any]]]:
+    """Stream-parse a binary file object into chunks of raw row dicts"""
+    if fmt == 'csv':
+        reader = csv.DictReader(io.TextIOWrapper(stream, encoding='utf-8', newline=''))
+        chunk = []
+        for raw in reader:
+            chunk.append(raw)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    elif fmt == 'jsonl':
+        chunk = []
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                chunk.append(json.loads(line))
+            except ValueError as e:
+                chunk.append({'__error__': f"invalid JSON: {e}"})
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    elif fmt == 'parquet':
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValueError("Parquet ingest requires pyarrow to be installed")
+        parquet_file = pq.ParquetFile(stream)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size):
+            yield batch.to_pylist()
+    else:
+        raise ValueError(f"Unsupported ingest format '{fmt}', expected one of {', '.join(FORMATS)}")
+
+
+def iter_validated_chunks(stream: io.BufferedIOBase, fmt: str,
+                          chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[List[tuple], List[Tuple[int, str]]]]:
+    """Yield (valid rows, [(row number, error)]) per chunk; row numbers are 1-based data rows"""
+    row_number = 0
+    for raw_chunk in iter_raw_chunks(stream, fmt, chunk_size):
+        rows, errors = [], []
+        for raw in raw_chunk:
+            row_number += 1
+            if not isinstance(raw, dict):
+                errors.append((row_number, "row must be an object"))
+                continue
+            if '__error__' in raw:
+                errors.append((row_number, raw['__error__']))
+                continue
+            try:
+                rows.append(validate_row(raw))
+            except ValueError as e:
+                errors.append((row_number, str(e)))
+        yield rows, errors
+
+
+def _iter_file_bytes(path: str, block_size: int = 1 << 20) -> Iterator[bytes]:
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                return
+            yield block
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Stream a roster file into the TeamForge personnel store")
+    parser.add_argument('path', help="CSV, JSONL or Parquet roster file")
+    parser.add_argument('--format', choices=FORMATS, help="Input format (inferred from the extension by default)")
+    parser.add_argument('--url', default=os.getenv('TEAMFORGE_URL', 'http://localhost:8000'), help="Backend base URL")
+    parser.add_argument('--replace', action='store_true', help="Replace the stored roster instead of upserting")
+    parser.add_argument('--dry-run', action='store_true', help="Validate locally without uploading")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    fmt = args.format or detect_format(args.path)
+
+    if args.dry_run:
+        started = time.perf_counter()
+        valid = error_count = 0
+        with open(args.path, 'rb') as f:
+            for rows, errors in iter_validated_chunks(f, fmt, args.chunk_size):
+                valid += len(rows)
+                error_count += len(errors)
+                for row_number, message in errors:
+                    print(f"row {row_number}: {message}", file=sys.stderr)
+        elapsed = time.perf_counter() - started
+        print(json.dumps({'valid': valid, 'errors': error_count, 'elapsedSeconds': round(elapsed, 3),
+                          'rowsPerSecond': round((valid + error_count) / elapsed) if elapsed else None}))
+        return 1 if error_count else 0
+
+    import httpx
+    response = httpx.post(
+        f"{args.url.rstrip('/')}/personnel/ingest",
+        params={'format': fmt, 'replace': str(args.replace).lower(), 'chunk_size': args.chunk_size},
+        content=_iter_file_bytes(args.path),
+        headers={'Content-Type': 'application/octet-stream'},
+        timeout=None
+    )
+    print(json.dumps(response.json(), indent=2))
+    return 0 if response.status_code == 200 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,369 @@
+# loadtest.py - Local load test for concurrent optimization jobs and WebSocket fan-out
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+# Events broadcast per optimization: run start, 4 agent inits, 4 running, 4 completed, orchestrator result
+EVENTS_PER_RUN = 14
+STALL_THRESHOLD = 0.05
+# One JSON object that satisfies every phase's structured output schema
+FAKE_LLM_REPLY = json.dumps({
+    "scores": {}, "gaps": [], "risks": [], "dynamics": ["[fake-llm] steady collaboration"],
+    "feasibility": 0.8, "summary": "[fake-llm] executive summary", "priorities": []
+})
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    k = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[k]
+
+
+def summarize(values: List[float]) -> Dict[str, Optional[float]]:
+    """Latency summary in milliseconds"""
+    def ms(value):
+        return round(value * 1000, 2) if value is not None else None
+    return {
+        'count': len(values),
+        'p50': ms(percentile(values, 50)),
+        'p90': ms(percentile(values, 90)),
+        'p99': ms(percentile(values, 99)),
+        'max': ms(max(values) if values else None)
+    }
+
+
+def build_personnel(count: int, seed: int = 7) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    skills = ["Python", "React", "AWS", "Java", "Go", "SQL", "Kubernetes", "TypeScript", "ML", "Docker"]
+    mbti_types = ["ENTJ", "ENFJ", "ENFP", "ENTP", "ESTJ", "ESFJ", "ESTP", "ESFP",
+                  "INTJ", "INFJ", "INFP", "INTP", "ISTJ", "ISFJ", "ISTP", "ISFP"]
+    return [
+        {
+            "name": f"Engineer {i}",
+            "skills": rng.sample(skills, rng.randint(2, 5)),
+            "experience": rng.choice(["junior", "mid", "senior", "lead"]),
+            "personality": rng.choice(["leadership", "analytical", "creative", "collaborative"]),
+            "mbtiType": rng.choice(mbti_types),
+            "experienceYears": rng.randint(1, 20),
+            "hourlyRate": float(rng.randint(40, 160))
+        }
+        for i in range(count)
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Server side: the real app with a fake LLM and an event-loop lag monitor
+# ---------------------------------------------------------------------------
+
+class LoopLagMonitor:
+    """Samples event-loop responsiveness by measuring sleep overshoot"""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.lags: List[float] = []
+        self.blocked_seconds = 0.0
+        self.stalls = 0
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(loop.time() - started - self.interval, 0.0)
+            self.lags.append(lag)
+            if lag >= STALL_THRESHOLD:
+                self.stalls += 1
+                self.blocked_seconds += lag
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'lag': summarize(self.lags),
+            'blockedSeconds': round(self.blocked_seconds, 4),
+            'stalls': self.stalls,
+            'stallThresholdMs': STALL_THRESHOLD * 1000
+        }
+
+
+def parse_fake_models(value: Optional[str]) -> Dict[str, float]:
+    """Parse 'strong=1.5,fast=0.2' into ordered {model name: mean latency}"""
+    models = {}
+    for item in filter(None, (part.strip() for part in (value or '').split(','))):
+        name, _, latency = item.partition('=')
+        models[name] = float(latency)
+    return models
+
+
+def build_model_routing(fake_models: Dict[str, float], phase_budget: float,
+                        run_deadline: Optional[float]) -> Dict[str, Any]:
+    """Route every phase through the fake models in the order given, strongest first"""
+    # The model id only has to be constructible; fake calls never reach it
+    return {
+        'models': [{'name': name, 'model': 'gemini/gemini-1.5-flash', 'expectedLatency': latency}
+                   for name, latency in fake_models.items()],
+        'phases': {phase: {'models': list(fake_models), 'latencyBudget': phase_budget}
+                   for phase in ('hrSkillsAnalyst', 'psychologyExpert', 'techArchitect', 'executiveStrategist')},
+        'runDeadline': run_deadline
+    }
+
+
+def install_fake_llm(main_module, latency: float, jitter: float, model_latencies: Optional[Dict[str, float]] = None):
+    """Replace model calls with a local fake that holds a worker thread like a real LLM call.
+
+    Each routed model sleeps for its own mean latency from model_latencies, or latency otherwise.
+    """
+    rng = random.Random(11)
+    model_latencies = model_latencies or {}
+
+    async def fake_invoke_model(self, phase, spec, task):
+        delay = max(rng.gauss(model_latencies.get(spec.name, latency), jitter), 0.0)
+        await asyncio.to_thread(time.sleep, delay)
+        return FAKE_LLM_REPLY
+
+    main_module.Real4AgentSystem._invoke_model = fake_invoke_model
+
+
+async def serve(port: int, latency: float, jitter: float, fake_models: Dict[str, float]):
+    os.environ.setdefault("GOOGLE_API_KEY", "loadtest-fake-key")
+    os.environ.setdefault("RUN_STORE_PATH", os.path.join(tempfile.mkdtemp(prefix="teamforge-loadtest-"), "runs.db"))
+    import uvicorn
+    import main
+
+    install_fake_llm(main, latency, jitter, fake_models)
+    monitor = LoopLagMonitor()
+
+    @main.app.get("/__loadtest/loop-stats")
+    async def loop_stats():
+        return monitor.stats()
+
+    config = uvicorn.Config(main.app, host="127.0.0.1", port=port, log_level="warning", ws_max_queue=1024)
+    monitor_task = asyncio.create_task(monitor.run())
+    try:
+        await uvicorn.Server(config).serve()
+    finally:
+        monitor_task.cancel()
+
+
+# ---------------------------------------------------------------------------
+# Client side: WebSocket subscribers and paced optimization requests
+# ---------------------------------------------------------------------------
+
+class Subscriber:
+    def __init__(self, index: int):
+        self.index = index
+        self.received = 0
+        self.lags: List[float] = []
+        self.connected = False
+        self.dropped = False
+
+    async def run(self, url: str, ready: asyncio.Event, stop: asyncio.Event):
+        import websockets
+        try:
+            async with websockets.connect(url, open_timeout=30, max_queue=None) as ws:
+                self.connected = True
+                ready.set()
+                while not stop.is_set():
+                    try:
+                        raw = await asyncio.wait_for(ws.recv(), timeout=0.5)
+                    except asyncio.TimeoutError:
+                        continue
+                    received_at = time.time()
+                    message = json.loads(raw)
+                    self.received += 1
+                    if 'sent_at' in message:
+                        self.lags.append(max(received_at - message['sent_at'], 0.0))
+        except Exception:
+            self.dropped = True
+            ready.set()
+
+
+async def run_load(args, base_url: str) -> Dict[str, Any]:
+    import httpx
+
+    ws_url = base_url.replace("http://", "ws://") + "/ws"
+    stop = asyncio.Event()
+    subscribers = [Subscriber(i) for i in range(args.subscribers)]
+    readiness = [asyncio.Event() for _ in subscribers]
+    subscriber_tasks = [asyncio.create_task(sub.run(ws_url, ready, stop)) for sub, ready in zip(subscribers, readiness)]
+    await asyncio.wait_for(asyncio.gather(*(ready.wait() for ready in readiness)), timeout=60)
+    connected = sum(1 for sub in subscribers if sub.connected)
+
+    personnel = build_personnel(args.personnel)
+
+    def request_body(index: int) -> Dict[str, Any]:
+        # Distinct project names keep single-flight coalescing from merging the jobs unless asked to
+        project_name = "Load Test" if args.coalesce else f"Load Test {index}"
+        return {
+            "requirements": {"projectName": project_name, "teamSize": args.team_size,
+                             "skills": ["Python", "React", "AWS"], "projectType": "web", "priority": "high",
+                             "timeline": "6"},
+            "personnel": personnel
+        }
+    latencies: List[float] = []
+    failures: Dict[str, int] = {}
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout,
+                                 limits=httpx.Limits(max_connections=args.requests)) as client:
+        async def fire(index: int):
+            started = time.perf_counter()
+            try:
+                response = await client.post("/optimize-team", json=request_body(index))
+                if response.status_code == 200:
+                    latencies.append(time.perf_counter() - started)
+                else:
+                    failures[str(response.status_code)] = failures.get(str(response.status_code), 0) + 1
+            except Exception as e:
+                failures[type(e).__name__] = failures.get(type(e).__name__, 0) + 1
+
+        load_started = time.perf_counter()
+        request_tasks = []
+        for i in range(args.requests):
+            request_tasks.append(asyncio.create_task(fire(i)))
+            if args.rate > 0 and i < args.requests - 1:
+                await asyncio.sleep(1 / args.rate)
+        await asyncio.gather(*request_tasks)
+        wall_time = time.perf_counter() - load_started
+
+        # Give in-flight broadcasts a moment to land before closing subscribers
+        await asyncio.sleep(args.drain)
+        loop_stats = (await client.get("/__loadtest/loop-stats")).json()
+        health = (await client.get("/health")).json()
+
+    stop.set()
+    await asyncio.gather(*subscriber_tasks)
+
+    event_lags = [lag for sub in subscribers for lag in sub.lags]
+    # Every subscriber sees every job that actually ran, however many requests shared it
+    jobs_started = health['coalescing']['jobsStarted']
+    expected_events = jobs_started * EVENTS_PER_RUN
+    return {
+        'config': {
+            'subscribers': args.subscribers, 'requests': args.requests, 'rate': args.rate,
+            'personnel': args.personnel, 'fakeLatency': args.fake_latency, 'fakeJitter': args.fake_jitter,
+            'fakeModels': args.fake_models, 'phaseBudget': args.phase_budget, 'runDeadline': args.run_deadline,
+            'coalesce': args.coalesce
+        },
+        'requests': {
+            'succeeded': len(latencies),
+            'jobsStarted': jobs_started,
+            'failed': failures,
+            'wallSeconds': round(wall_time, 3),
+            'throughputPerSecond': round(len(latencies) / wall_time, 2) if wall_time else None,
+            'latency': summarize(latencies)
+        },
+        'websocket': {
+            'connected': connected,
+            'dropped': sum(1 for sub in subscribers if sub.dropped),
+            'eventsReceived': sum(sub.received for sub in subscribers),
+            'minEventsPerSubscriber': min((sub.received for sub in subscribers if sub.connected), default=0),
+            'expectedEventsPerSubscriber': expected_events,
+            'deliveryLag': summarize(event_lags)
+        },
+        'eventLoop': loop_stats,
+        'models': health['modelRouting']['models']
+    }
+
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_until_healthy(base_url: str, timeout: float = 60.0):
+    import httpx
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not become healthy within {timeout}s")
+
+
+def print_report(report: Dict[str, Any]):
+    requests = report['requests']
+    websocket = report['websocket']
+    loop = report['eventLoop']
+    print("\n=== TeamForge load test ===")
+    print(f"Requests: {requests['succeeded']} ok, failed {requests['failed'] or 0}, "
+          f"{requests['throughputPerSecond']}/s over {requests['wallSeconds']}s, {requests['jobsStarted']} jobs run")
+    print(f"  latency ms  p50={requests['latency']['p50']} p90={requests['latency']['p90']} "
+          f"p99={requests['latency']['p99']} max={requests['latency']['max']}")
+    print(f"WebSockets: {websocket['connected']} connected, {websocket['dropped']} dropped, "
+          f"{websocket['eventsReceived']} events (min {websocket['minEventsPerSubscriber']} / "
+          f"expected {websocket['expectedEventsPerSubscriber']} per subscriber)")
+    print(f"  delivery lag ms  p50={websocket['deliveryLag']['p50']} p90={websocket['deliveryLag']['p90']} "
+          f"p99={websocket['deliveryLag']['p99']} max={websocket['deliveryLag']['max']}")
+    print(f"Event loop: blocked {loop['blockedSeconds']}s in {loop['stalls']} stalls "
+          f"(>= {loop['stallThresholdMs']}ms), lag ms p99={loop['lag']['p99']} max={loop['lag']['max']}")
+    for name, model in report['models'].items():
+        print(f"Model {name}: {model['calls']} calls, {model['failures']} over budget or failed, "
+              f"expected latency {model['expectedLatency']}s")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load test the backend locally with a fake LLM")
+    parser.add_argument('--subscribers', type=int, default=100, help="WebSocket subscribers to open")
+    parser.add_argument('--requests', type=int, default=20, help="Optimization requests to send")
+    parser.add_argument('--rate', type=float, default=5.0, help="Requests started per second (0 = all at once)")
+    parser.add_argument('--personnel', type=int, default=30, help="Roster size per request")
+    parser.add_argument('--team-size', type=int, default=5)
+    parser.add_argument('--coalesce', action='store_true',
+                        help="Send identical requests so single-flight coalescing can merge them")
+    parser.add_argument('--fake-latency', type=float, default=0.5, help="Mean seconds per fake LLM call")
+    parser.add_argument('--fake-jitter', type=float, default=0.1, help="Std dev of fake LLM latency")
+    parser.add_argument('--fake-models', help="Route phases through fake models, e.g. 'strong=1.5,fast=0.2' "
+                                              "(name=mean seconds, most preferred first)")
+    parser.add_argument('--phase-budget', type=float, default=120.0, help="Per-phase latency budget with --fake-models")
+    parser.add_argument('--run-deadline', type=float, help="Whole-run deadline in seconds with --fake-models")
+    parser.add_argument('--timeout', type=float, default=300.0, help="Per-request timeout in seconds")
+    parser.add_argument('--drain', type=float, default=1.0, help="Seconds to wait for trailing events")
+    parser.add_argument('--json', dest='json_output', help="Also write the report as JSON to this path")
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        asyncio.run(serve(args.port, args.fake_latency, args.fake_jitter, parse_fake_models(args.fake_models)))
+        return 0
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    command = [sys.executable, os.path.abspath(__file__), '--serve', '--port', str(port),
+               '--fake-latency', str(args.fake_latency), '--fake-jitter', str(args.fake_jitter)]
+    env = dict(os.environ)
+    if args.fake_models:
+        command += ['--fake-models', args.fake_models]
+        env['MODEL_ROUTING'] = json.dumps(build_model_routing(parse_fake_models(args.fake_models),
+                                                              args.phase_budget, args.run_deadline))
+    server = subprocess.Popen(command, cwd=os.path.dirname(os.path.abspath(__file__)), env=env)
+    try:
+        asyncio.run(wait_until_healthy(base_url))
+        report = asyncio.run(run_load(args, base_url))
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    print_report(report)
+    if args.json_output:
+        with open(args.json_output, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 0 if not report['requests']['failed'] and not report['websocket']['dropped'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
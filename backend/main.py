@@ -1,16 +1,36 @@
 # main.py - Real 4 Specialized AI Agents with MBTI Integration
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Header, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Dict, Any, Optional, ClassVar, Literal
+from abc import ABC, abstractmethod
 import asyncio
+import codecs
+import contextvars
+import cProfile
+import functools
+import hashlib
+import hmac
 import json
 import logging
-from datetime import datetime
+import pstats
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 import os
+import numpy as np
 from dotenv import load_dotenv
 
+from ingest import ROW_FIELDS, FORMATS, DEFAULT_CHUNK_SIZE, iter_validated_chunks, validate_row
+
 # Load environment variables first
 load_dotenv()
 
@@ -38,6 +58,21 @@ app.add_middleware(
 )
 
 # Enhanced Pydantic models with MBTI
+def check_date_range(start: Optional[date], end: Optional[date]):
+    if start is not None and end is not None and end < start:
+        raise ValueError("endDate must not be before startDate")
+
+class Allocation(BaseModel):
+    projectName: str
+    startDate: date
+    endDate: date  # Inclusive
+    fraction: float = Field(1.0, ge=0.0, le=1.0)  # Share of the person's capacity committed to the project
+    
+    @model_validator(mode='after')
+    def check_dates(self):
+        check_date_range(self.startDate, self.endDate)
+        return self
+
 class Person(BaseModel):
     id: Optional[int] = None
     name: str
@@ -48,6 +83,7 @@ class Person(BaseModel):
     experienceYears: int
     availability: Optional[str] = "full-time"
     hourlyRate: Optional[float] = 0.0
+    allocations: List[Allocation] = []  # Existing project commitments
 
 class ProjectRequirements(BaseModel):
     projectName: str
@@ -57,14 +93,86 @@ class ProjectRequirements(BaseModel):
     priority: str
     timeline: Optional[str] = None
     budget: Optional[str] = None
+    startDate: Optional[date] = None  # Enables capacity checks when set
+    endDate: Optional[date] = None  # Defaults to startDate + timeline months
+    requiredAllocation: float = Field(0.5, ge=0.0, le=1.0)  # Minimum free capacity per team member
+    
+    @model_validator(mode='after')
+    def check_dates(self):
+        check_date_range(self.startDate, self.endDate)
+        return self
 
 class OptimizationRequest(BaseModel):
     requirements: ProjectRequirements
     personnel: List[Person]
 
+class CapacityQuery(BaseModel):
+    personnel: List[Person]
+    startDate: date
+    endDate: date
+    minFreeCapacity: float = Field(0.5, ge=0.0, le=1.0)
+    skills: List[str] = []  # People must have all of these
+    
+    @model_validator(mode='after')
+    def check_dates(self):
+        check_date_range(self.startDate, self.endDate)
+        return self
+
+# Structured agent phase outputs
+class HRPhaseOutput(BaseModel):
+    SCHEMA_HINT: ClassVar[str] = '{"scores":{"<person name>":{"<required skill>":<1-10>}},"gaps":["<skill>"]}'
+    scores: Dict[str, Dict[str, float]]
+    gaps: List[str] = []
+
+class PairRiskFlag(BaseModel):
+    a: str
+    b: str
+    level: Literal['low', 'medium', 'high']
+    reason: str = ''
+
+class PsychologyPhaseOutput(BaseModel):
+    SCHEMA_HINT: ClassVar[str] = ('{"risks":[{"a":"<name>","b":"<name>","level":"low|medium|high","reason":"<max 12 words>"}],'
+                                  '"dynamics":["<max 15 words>"]}')
+    risks: List[PairRiskFlag] = []
+    dynamics: List[str] = []
+
+class TechnicalPhaseOutput(BaseModel):
+    SCHEMA_HINT: ClassVar[str] = '{"feasibility":<0-1>,"risks":["<max 15 words>"]}'
+    feasibility: float
+    risks: List[str] = []
+
+class ExecutivePhaseOutput(BaseModel):
+    SCHEMA_HINT: ClassVar[str] = '{"summary":"<max 120 words>","priorities":["<max 15 words>"]}'
+    summary: str
+    priorities: List[str] = []
+
+MAX_REPAIR_ECHO_CHARS = 2000
+
+def parse_phase_output(text: str, schema: type) -> BaseModel:
+    """Parse and validate an agent's JSON reply, tolerating code fences or stray prose around it"""
+    start, end = text.find('{'), text.rfind('}')
+    if start == -1 or end < start:
+        raise ValueError("No JSON object found in response")
+    # Pydantic's Rust JSON parser validates in the same pass
+    return schema.model_validate_json(text[start:end + 1])
+
+class SweepWeights(BaseModel):
+    performance: float = 1.0
+    mbtiCompatibility: float = 1.0
+    diversity: float = 1.0
+    skillCoverage: float = 1.0
+
+class SweepRequest(BaseModel):
+    requirements: ProjectRequirements
+    personnel: List[Person]
+    teamSizes: Optional[List[int]] = None  # Defaults to requirements.teamSize
+    budgetCaps: List[Optional[float]] = [None]  # Max total hourly rate per team, None for uncapped
+    weights: List[SweepWeights] = [SweepWeights()]
+
 class WebSocketManager:
     def __init__(self):
         self.active_connections: List[WebSocket] = []
+        self.relay = None  # Shared state backend that fans events out to every worker
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
@@ -75,33 +183,207 @@ class WebSocketManager:
             self.active_connections.remove(websocket)
 
     async def broadcast(self, message: dict):
-        for connection in self.active_connections.copy():
-            try:
-                await connection.send_text(json.dumps(message))
-            except:
-                self.active_connections.remove(connection)
+        # Serialize once for every subscriber; sent_at lets clients measure delivery lag
+        payload = json.dumps({**message, "sent_at": time.time()}, default=str)
+        if self.relay is not None:
+            await self.relay.publish(PROGRESS_CHANNEL, payload)
+        else:
+            await self.deliver(payload)
+
+    async def deliver(self, payload: str):
+        """Send a serialized event to the connections held by this worker"""
+        connections = self.active_connections.copy()
+        results = await asyncio.gather(
+            *(connection.send_text(payload) for connection in connections),
+            return_exceptions=True
+        )
+        for connection, result in zip(connections, results):
+            if isinstance(result, Exception):
+                self.disconnect(connection)
 
 manager = WebSocketManager()
 
-def get_gemini_llm():
-    """Get Gemini LLM for CrewAI using proper configuration"""
-    api_key = os.getenv("GOOGLE_API_KEY")
-    if not api_key:
-        raise ValueError("GOOGLE_API_KEY environment variable is required")
+# Model Routing
+PHASE_ORDER = ['hrSkillsAnalyst', 'psychologyExpert', 'techArchitect', 'executiveStrategist']
+
+class ModelSpec(BaseModel):
+    """One LLM the router can send an agent phase to"""
+    name: str
+    model: str  # CrewAI model id, e.g. gemini/gemini-1.5-flash
+    apiKeyEnv: Optional[str] = "GOOGLE_API_KEY"
+    expectedLatency: float = 10.0  # Seconds per call, used until calls are observed
+    costPer1kTokens: float = 0.0
+
+class PhaseRoute(BaseModel):
+    """Models to try for one agent phase, most preferred first, with its budgets"""
+    models: List[str]
+    latencyBudget: float = 120.0  # Seconds for the phase, including a repair retry
+    costBudget: Optional[float] = None  # Estimated spend for the phase
+
+class ModelRoutingConfig(BaseModel):
+    """Per-phase model routing, loaded from MODEL_ROUTING"""
+    models: List[ModelSpec]
+    phases: Dict[str, PhaseRoute]
+    runDeadline: Optional[float] = None  # Seconds for all four phases together
     
-    llm = LLM(
-        model="gemini/gemini-1.5-flash",
-        api_key=api_key
-    )
+    @classmethod
+    def default(cls) -> 'ModelRoutingConfig':
+        flash = ModelSpec(name='gemini-flash', model='gemini/gemini-1.5-flash', costPer1kTokens=0.0003)
+        return cls(models=[flash], phases={phase: PhaseRoute(models=[flash.name]) for phase in PHASE_ORDER})
     
-    logger.info("✅ Gemini LLM configured for CrewAI")
+    @classmethod
+    def load(cls, value: Optional[str]) -> 'ModelRoutingConfig':
+        """Parse inline JSON or a JSON file path; empty means the default single-model routing"""
+        if not value:
+            return cls.default()
+        if value.lstrip().startswith('{'):
+            return cls.model_validate_json(value)
+        with open(value) as f:
+            return cls.model_validate_json(f.read())
+
+# Absolute monotonic deadline of the run being analysed in this task, if any
+RUN_DEADLINE: contextvars.ContextVar = contextvars.ContextVar('run_deadline', default=None)
+
+def create_llm(spec: ModelSpec) -> LLM:
+    """Build the CrewAI LLM for a routed model"""
+    api_key = os.getenv(spec.apiKeyEnv) if spec.apiKeyEnv else None
+    if spec.apiKeyEnv and not api_key:
+        raise ValueError(f"{spec.apiKeyEnv} environment variable is required")
+    
+    llm = LLM(model=spec.model, api_key=api_key)
+    
+    logger.info(f"✅ {spec.model} configured for CrewAI")
     return llm
 
+class ModelLatencyTracker:
+    """Exponentially weighted latency observed per model"""
+    
+    def __init__(self, alpha: float = 0.3, stale_after: float = 300.0):
+        self.alpha = alpha
+        self.stale_after = stale_after  # Fall back to the prior so slow models get re-probed
+        self.models: Dict[str, Dict[str, Any]] = {}
+    
+    def record(self, name: str, seconds: float, ok: bool = True):
+        entry = self.models.setdefault(name, {'calls': 0, 'failures': 0, 'latency': seconds, 'observedAt': 0.0})
+        entry['calls'] += 1
+        if not ok:
+            entry['failures'] += 1
+        entry['latency'] = seconds if entry['calls'] == 1 else self.alpha * seconds + (1 - self.alpha) * entry['latency']
+        entry['observedAt'] = time.monotonic()
+    
+    def expected(self, name: str, prior: float) -> float:
+        entry = self.models.get(name)
+        if entry is None or time.monotonic() - entry['observedAt'] > self.stale_after:
+            return prior
+        return entry['latency']
+
+class ModelRouter:
+    """Picks the model for each agent phase within its latency and cost budgets.
+
+    A phase goes to the first model in its route whose expected latency fits the time left,
+    where time left is the phase budget capped by the run deadline minus what the later
+    phases need. None means no model fits and the phase should use its deterministic path.
+    """
+    
+    OUTPUT_TOKENS = 400  # Rough size of a compact JSON reply
+    
+    def __init__(self, config: ModelRoutingConfig, latency: Optional[ModelLatencyTracker] = None):
+        self.config = config
+        self.specs = {spec.name: spec for spec in config.models}
+        for phase, route in config.phases.items():
+            unknown = [name for name in route.models if name not in self.specs]
+            if unknown:
+                raise ValueError(f"Phase {phase} routes to unknown models: {', '.join(unknown)}")
+        self.latency = latency or ModelLatencyTracker()
+        self._llms: Dict[str, LLM] = {}
+    
+    def validate_credentials(self):
+        for spec in self.config.models:
+            if spec.apiKeyEnv and not os.getenv(spec.apiKeyEnv):
+                raise ValueError(f"{spec.apiKeyEnv} environment variable is required")
+    
+    def llm_for(self, spec: ModelSpec) -> LLM:
+        if spec.name not in self._llms:
+            self._llms[spec.name] = create_llm(spec)
+        return self._llms[spec.name]
+    
+    def expected_latency(self, name: str) -> float:
+        return self.latency.expected(name, self.specs[name].expectedLatency)
+    
+    def estimated_cost(self, spec: ModelSpec, prompt: str) -> float:
+        # ~4 characters per token
+        return (len(prompt) / 4 + self.OUTPUT_TOKENS) / 1000 * spec.costPer1kTokens
+    
+    def time_budget(self, phase: str, phase_elapsed: float) -> float:
+        """Seconds the phase may still spend on a model call"""
+        route = self.config.phases.get(phase)
+        budget = (route.latencyBudget if route else float('inf')) - phase_elapsed
+        deadline = RUN_DEADLINE.get()
+        if deadline is not None:
+            later_phases = PHASE_ORDER[PHASE_ORDER.index(phase) + 1:] if phase in PHASE_ORDER else []
+            reserve = sum(
+                min((self.expected_latency(name) for name in self.config.phases[later].models), default=0.0)
+                for later in later_phases if later in self.config.phases
+            )
+            budget = min(budget, deadline - time.monotonic() - reserve)
+        return budget
+    
+    def choose(self, phase: str, time_budget: float, prompt: str, cost_spent: float = 0.0,
+               exclude: Optional[set] = None) -> Optional[ModelSpec]:
+        route = self.config.phases.get(phase)
+        if route is None:
+            return None
+        for name in route.models:
+            if exclude and name in exclude:
+                continue
+            spec = self.specs[name]
+            if route.costBudget is not None and cost_spent + self.estimated_cost(spec, prompt) > route.costBudget:
+                continue
+            if self.expected_latency(name) <= time_budget:
+                return spec
+        return None
+    
+    def call_timeout(self, phase: str, spec: ModelSpec, time_budget: float, tried: set) -> float:
+        """Cap a call so the quickest untried model still fits afterwards, when the chosen one can spare it"""
+        fallbacks = [self.expected_latency(name) for name in self.config.phases[phase].models if name not in tried]
+        # Double the fallback's expected latency as headroom for jitter
+        reserve = 2 * min(fallbacks, default=0.0)
+        if fallbacks and self.expected_latency(spec.name) + reserve <= time_budget:
+            return time_budget - reserve
+        return time_budget
+    
+    def record(self, name: str, seconds: float, ok: bool = True):
+        self.latency.record(name, seconds, ok)
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'models': {
+                spec.name: {
+                    'model': spec.model,
+                    'expectedLatency': round(self.expected_latency(spec.name), 4),
+                    'calls': self.latency.models.get(spec.name, {}).get('calls', 0),
+                    'failures': self.latency.models.get(spec.name, {}).get('failures', 0)
+                }
+                for spec in self.config.models
+            },
+            'phases': {phase: route.dict() for phase, route in self.config.phases.items()},
+            'runDeadline': self.config.runDeadline
+        }
+
+model_router = ModelRouter(ModelRoutingConfig.load(os.getenv("MODEL_ROUTING")))
+
+# Crew kickoffs block a thread for the whole LLM call (and past a timeout, since they cannot be
+# interrupted), so they get their own bounded pool instead of starving asyncio.to_thread work
+LLM_MAX_WORKERS = int(os.getenv("LLM_MAX_WORKERS", "16"))
+llm_executor = ThreadPoolExecutor(max_workers=LLM_MAX_WORKERS, thread_name_prefix="llm")
+
 class RealAgentProgressTracker:
-    """Tracks progress for 4 real specialized agents"""
+    """Tracks progress for 4 real specialized agents during one run"""
     
-    def __init__(self, websocket_manager):
+    def __init__(self, websocket_manager, state: Optional['SharedStateBackend'] = None, run_id: Optional[str] = None):
         self.websocket_manager = websocket_manager
+        self.state = state
+        self.run_id = run_id
         self.agents = {
             'hrSkillsAnalyst': {'name': 'HR Skills Analyst', 'progress': 0, 'status': 'ready'},
             'psychologyExpert': {'name': 'Psychology Expert', 'progress': 0, 'status': 'ready'},
@@ -119,6 +401,11 @@ class RealAgentProgressTracker:
                 'message': message
             })
             
+            if status == 'running':
+                profiler = ACTIVE_PROFILER.get()
+                if profiler:
+                    profiler.current_phase = agent_type
+            
             # Store agent results for next agent to use
             if results:
                 self.agent_results[agent_type] = results
@@ -127,8 +414,22 @@ class RealAgentProgressTracker:
                 "agent_type": agent_type,
                 "status": status,
                 "progress": progress,
-                "message": message
+                "message": message,
+                "run_id": self.run_id
             })
+            await self.publish_job_status('running')
+    
+    async def publish_job_status(self, status: str, **extra):
+        """Record this run's status in shared state so any worker can answer status queries"""
+        if self.state is None or not self.run_id:
+            return
+        await self.state.set_job(self.run_id, {
+            'runId': self.run_id,
+            'status': status,
+            'agents': self.agents,
+            'updatedAt': datetime.now().isoformat(),
+            **extra
+        })
     
     async def initialize_all_agents(self):
         """Initialize all agents for new optimization"""
@@ -199,6 +500,15 @@ class MBTICompatibilityEngine:
         
         return total_score / comparisons if comparisons > 0 else 0.7
     
+    @classmethod
+    def pair_compatibility(cls, mbti1: str, mbti2: str) -> float:
+        """Compatibility score between two MBTI types, checking both directions"""
+        compatibility_matrix = cls.get_mbti_compatibility_matrix()
+        score = compatibility_matrix.get(mbti1, {}).get(mbti2, 0.7)
+        if score == 0.7:
+            score = compatibility_matrix.get(mbti2, {}).get(mbti1, 0.7)
+        return score
+    
     @staticmethod
     def personality_to_mbti(personality: str) -> str:
         """Convert personality description to MBTI type"""
@@ -212,6 +522,42 @@ class MBTICompatibilityEngine:
         }
         return mapping.get(personality.lower(), 'ENFP')  # Default to ENFP
     
+    @classmethod
+    def count_types(cls, members: List[Person]) -> Dict[str, int]:
+        """Number of people per MBTI type"""
+        counts: Dict[str, int] = {}
+        for member in members:
+            mbti = member.mbtiType or cls.personality_to_mbti(member.personality)
+            counts[mbti] = counts.get(mbti, 0) + 1
+        return counts
+    
+    @classmethod
+    def conflict_histogram(cls, members: List[Person], threshold: float = 0.6) -> Dict[str, Any]:
+        """Aggregate low-compatibility pairs by MBTI type pair in O(n + types^2)"""
+        counts = cls.count_types(members)
+        types = sorted(counts)
+        conflict_pairs = []
+        for i, mbti1 in enumerate(types):
+            for mbti2 in types[i:]:
+                score = cls.pair_compatibility(mbti1, mbti2)
+                if score >= threshold:
+                    continue
+                if mbti1 == mbti2:
+                    pairs = counts[mbti1] * (counts[mbti1] - 1) // 2
+                else:
+                    pairs = counts[mbti1] * counts[mbti2]
+                if pairs:
+                    conflict_pairs.append({'types': [mbti1, mbti2], 'pairs': pairs, 'compatibility': score})
+        conflict_pairs.sort(key=lambda entry: (entry['compatibility'], -entry['pairs']))
+        
+        total = len(members)
+        return {
+            'typeCounts': counts,
+            'conflictPairs': conflict_pairs,
+            'totalConflictPairs': sum(entry['pairs'] for entry in conflict_pairs),
+            'totalPairs': total * (total - 1) // 2
+        }
+    
     @classmethod
     def identify_potential_conflicts(cls, team_members: List[Person]) -> List[str]:
         """Identify potential personality conflicts in team"""
@@ -233,24 +579,427 @@ class MBTICompatibilityEngine:
         
         return conflicts
 
+class AllocationIntervalIndex:
+    """Static augmented interval tree over allocation date ranges.
+
+    CapacityCalendar builds one per request from the payload roster, so construction is
+    O(n log n) per request and only the queries within that request are O(log n + hits).
+    """
+    
+    def __init__(self, intervals: List[tuple]):
+        # intervals: (start_ordinal, end_ordinal, person_index, fraction), end inclusive
+        ordered = sorted(intervals)
+        self.starts = [interval[0] for interval in ordered]
+        self.ends = [interval[1] for interval in ordered]
+        self.owners = [interval[2] for interval in ordered]
+        self.fractions = [interval[3] for interval in ordered]
+        # Implicit balanced BST over the sorted array; max_end[mid] covers the subtree rooted at mid
+        self.max_end = [0] * len(ordered)
+        self._build(0, len(ordered))
+    
+    def _build(self, lo: int, hi: int) -> int:
+        if lo >= hi:
+            return -1
+        mid = (lo + hi) // 2
+        self.max_end[mid] = max(self.ends[mid], self._build(lo, mid), self._build(mid + 1, hi))
+        return self.max_end[mid]
+    
+    def overlapping(self, start: int, end: int) -> List[int]:
+        """Positions of intervals intersecting [start, end] in O(log n + hits)"""
+        hits = []
+        stack = [(0, len(self.starts))]
+        while stack:
+            lo, hi = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            if self.max_end[mid] < start:
+                continue
+            stack.append((lo, mid))
+            if self.starts[mid] <= end:
+                if self.ends[mid] >= start:
+                    hits.append(mid)
+                stack.append((mid + 1, hi))
+        return hits
+
+class CapacityCalendar:
+    """Fractional capacity model for a roster across dated project allocations"""
+    
+    AVAILABILITY_CAPACITY = {'full-time': 1.0, 'part-time': 0.5, 'contract': 1.0, 'unavailable': 0.0}
+    
+    def __init__(self, personnel: List[Person]):
+        self.personnel = personnel
+        self.capacities = [self.parse_availability(person.availability) for person in personnel]
+        self.skill_index: Dict[str, set] = {}
+        intervals = []
+        for idx, person in enumerate(personnel):
+            for skill in person.skills:
+                self.skill_index.setdefault(skill, set()).add(idx)
+            for allocation in person.allocations:
+                intervals.append((allocation.startDate.toordinal(), allocation.endDate.toordinal(), idx, allocation.fraction))
+        self.index = AllocationIntervalIndex(intervals)
+    
+    @classmethod
+    def parse_availability(cls, availability: Optional[str]) -> float:
+        """Convert the free-form availability string into a capacity fraction"""
+        if not availability:
+            return 1.0
+        value = availability.strip().lower()
+        if value in cls.AVAILABILITY_CAPACITY:
+            return cls.AVAILABILITY_CAPACITY[value]
+        try:
+            if value.endswith('%'):
+                return min(max(float(value[:-1]) / 100, 0.0), 1.0)
+            return min(max(float(value), 0.0), 1.0)
+        except ValueError:
+            return 1.0
+    
+    @staticmethod
+    def project_window(requirements: ProjectRequirements) -> Optional[tuple]:
+        """Dated project window, deriving the end date from the timeline in months when needed"""
+        if not requirements.startDate:
+            return None
+        end_date = requirements.endDate
+        if end_date is None:
+            try:
+                months = float(requirements.timeline) if requirements.timeline else 0
+            except ValueError:
+                months = 0
+            end_date = requirements.startDate + timedelta(days=max(int(months * 30), 1) - 1)
+        return requirements.startDate, end_date
+    
+    def peak_allocations(self, start: date, end: date) -> Dict[int, float]:
+        """Highest concurrent allocation per person inside the window, for people with any overlap"""
+        start_ord, end_ord = start.toordinal(), end.toordinal()
+        events: Dict[int, List[tuple]] = {}
+        for pos in self.index.overlapping(start_ord, end_ord):
+            fraction = self.index.fractions[pos]
+            person_events = events.setdefault(self.index.owners[pos], [])
+            person_events.append((max(self.index.starts[pos], start_ord), fraction))
+            person_events.append((min(self.index.ends[pos], end_ord) + 1, -fraction))
+        
+        peaks = {}
+        for idx, person_events in events.items():
+            load = peak = 0.0
+            for _, delta in sorted(person_events):
+                load += delta
+                peak = max(peak, load)
+            peaks[idx] = peak
+        return peaks
+    
+    def free_capacity(self, start: date, end: date) -> List[float]:
+        """Guaranteed free capacity per person across the whole window"""
+        peaks = self.peak_allocations(start, end)
+        return [max(capacity - peaks.get(idx, 0.0), 0.0) for idx, capacity in enumerate(self.capacities)]
+    
+    def query(self, start: date, end: date, min_free: float, skills: List[str] = None) -> List[Dict[str, Any]]:
+        """People with at least min_free capacity in the window who have all the given skills"""
+        candidates = set(range(len(self.personnel)))
+        for skill in skills or []:
+            candidates &= self.skill_index.get(skill, set())
+        peaks = self.peak_allocations(start, end)
+        available = []
+        for idx in sorted(candidates):
+            free = max(self.capacities[idx] - peaks.get(idx, 0.0), 0.0)
+            if free >= min_free:
+                available.append({
+                    'name': self.personnel[idx].name,
+                    'capacity': self.capacities[idx],
+                    'peakAllocation': round(peaks.get(idx, 0.0), 4),
+                    'freeCapacity': round(free, 4)
+                })
+        return available
+
+class RosterFeatures:
+    """Roster-level arrays reused across sweep grid points and persisted as snapshots"""
+    
+    EXPERIENCE_MULTIPLIERS = {'junior': 0.6, 'mid': 0.7, 'senior': 0.9, 'lead': 1.0}
+    ARRAYS = ('skill_scores', 'rates', 'experience_codes', 'mbti_codes', 'type_compatibility', 'skill_bits')
+    
+    def __init__(self, arrays: Dict[str, np.ndarray], vocabularies: Dict[str, List[str]]):
+        for name in self.ARRAYS:
+            setattr(self, name, arrays[name])
+        self.size = len(self.skill_scores)
+        self.experience_levels = vocabularies['experience']
+        self.mbti_types = vocabularies['mbti']
+        self.skills = vocabularies['skills']
+        self.skill_index = {skill: i for i, skill in enumerate(self.skills)}
+    
+    @classmethod
+    def build(cls, personnel: List[Person], mbti_engine: MBTICompatibilityEngine) -> 'RosterFeatures':
+        # Same scoring as the HR phase heuristic so sweep metrics line up with full runs
+        exp_multiplier = np.array([cls.EXPERIENCE_MULTIPLIERS.get(p.experience, 0.7) for p in personnel])
+        skill_counts = np.array([len(p.skills) for p in personnel])
+        
+        experience_levels = sorted({p.experience for p in personnel})
+        experience_index = {level: i for i, level in enumerate(experience_levels)}
+        
+        # Pairwise compatibility only depends on MBTI type, so store a type x type table
+        mbti_labels = [p.mbtiType or mbti_engine.personality_to_mbti(p.personality) for p in personnel]
+        mbti_types = sorted(set(mbti_labels))
+        type_index = {mbti: i for i, mbti in enumerate(mbti_types)}
+        
+        # Skills as packed bitsets: one row of ceil(skills / 8) bytes per person
+        skills = sorted({skill for p in personnel for skill in p.skills})
+        skill_index = {skill: i for i, skill in enumerate(skills)}
+        skill_matrix = np.zeros((len(personnel), len(skills)), dtype=bool)
+        for row, person in enumerate(personnel):
+            skill_matrix[row, [skill_index[skill] for skill in person.skills]] = True
+        
+        arrays = {
+            'skill_scores': np.minimum(skill_counts * 0.15 + exp_multiplier, 1.0),
+            'rates': np.array([p.hourlyRate or 0.0 for p in personnel], dtype=np.float64),
+            'experience_codes': np.array([experience_index[p.experience] for p in personnel], dtype=np.int32),
+            'mbti_codes': np.array([type_index[label] for label in mbti_labels], dtype=np.int32),
+            'type_compatibility': np.array([
+                [mbti_engine.pair_compatibility(a, b) for b in mbti_types] for a in mbti_types
+            ], dtype=np.float64).reshape(len(mbti_types), len(mbti_types)),
+            'skill_bits': np.packbits(skill_matrix, axis=1)
+        }
+        return cls(arrays, {'experience': experience_levels, 'mbti': mbti_types, 'skills': skills})
+    
+    @staticmethod
+    def feature_key(person: Person) -> str:
+        """The fields build() reads for one person, joined cheaply enough to key every sweep request"""
+        return '\x1f'.join((person.experience, person.mbtiType or '', person.personality, repr(person.hourlyRate),
+                            '\x1e'.join(person.skills)))
+    
+    def skill_mask(self, skills: List[str]) -> np.ndarray:
+        """Packed bitset of the given skills that exist in this roster"""
+        mask = np.zeros(len(self.skills), dtype=bool)
+        mask[[self.skill_index[skill] for skill in skills if skill in self.skill_index]] = True
+        return np.packbits(mask)
+
+class RosterSnapshotStore:
+    """Versioned, memory-mapped on-disk snapshots of RosterFeatures keyed by roster hash.
+
+    Arrays are written as .npy files next to a small manifest and opened with mmap_mode='r',
+    so worker processes share the same read-only pages instead of rebuilding them. Rows are
+    stored in canonical roster order, so any ordering of the same roster maps onto one snapshot.
+    Every hit touches the snapshot directory, so eviction by mtime drops the least recently used.
+    """
+    
+    VERSION = 1
+    
+    def __init__(self, directory: str, max_rosters: int = 32, memory_slots: int = 8):
+        self.directory = os.path.join(directory, f"v{self.VERSION}")
+        self.max_rosters = max_rosters
+        self.memory_slots = memory_slots
+        self._loaded: "OrderedDict[str, RosterFeatures]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _path(self, roster_hash: str) -> str:
+        return os.path.join(self.directory, roster_hash)
+    
+    def load(self, roster_hash: str) -> Optional[RosterFeatures]:
+        """Map a snapshot from disk, or None if it is missing or from another version"""
+        path = self._path(roster_hash)
+        try:
+            with open(os.path.join(path, "manifest.json")) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if manifest.get('version') != self.VERSION:
+            return None
+        try:
+            arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r') for name in RosterFeatures.ARRAYS}
+        except (OSError, ValueError):
+            # Another worker evicted the snapshot after we read its manifest
+            return None
+        self._touch(roster_hash)
+        return RosterFeatures(arrays, manifest['vocabularies'])
+    
+    def _touch(self, roster_hash: str):
+        """Mark a snapshot as recently used for eviction across workers"""
+        try:
+            os.utime(self._path(roster_hash))
+        except OSError:
+            pass
+    
+    def save(self, roster_hash: str, features: RosterFeatures):
+        """Write a snapshot atomically; concurrent writers of the same roster keep the first copy"""
+        os.makedirs(self.directory, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=f".{roster_hash[:12]}-", dir=self.directory)
+        for name in RosterFeatures.ARRAYS:
+            np.save(os.path.join(staging, f"{name}.npy"), np.ascontiguousarray(getattr(features, name)))
+        with open(os.path.join(staging, "manifest.json"), 'w') as f:
+            json.dump({
+                'version': self.VERSION,
+                'rosterHash': roster_hash,
+                'createdAt': datetime.now().isoformat(),
+                'size': features.size,
+                'vocabularies': {'experience': features.experience_levels, 'mbti': features.mbti_types,
+                                 'skills': features.skills}
+            }, f)
+        try:
+            os.rename(staging, self._path(roster_hash))
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+        self._evict_old_snapshots()
+    
+    def _evict_old_snapshots(self):
+        """Remove the least recently used snapshots beyond max_rosters"""
+        snapshots = []
+        for entry in os.scandir(self.directory):
+            if entry.is_dir() and not entry.name.startswith('.'):
+                try:
+                    snapshots.append((entry.stat().st_mtime, entry.path))
+                except OSError:
+                    continue  # Already removed by another worker
+        snapshots.sort(reverse=True)
+        for _, path in snapshots[self.max_rosters:]:
+            shutil.rmtree(path, ignore_errors=True)
+    
+    def get_or_build(self, personnel: List[Person], mbti_engine: MBTICompatibilityEngine) -> tuple:
+        """Return (features, source, order) where source is 'memory', 'disk' or 'built'.
+
+        Feature row i describes personnel[order[i]]; callers index their own per-person data by order.
+        """
+        # Names are not features; callers take them from their own roster via order
+        entries = [RosterFeatures.feature_key(person) for person in personnel]
+        order = sorted(range(len(personnel)), key=entries.__getitem__)
+        roster_hash = hashlib.sha256('\n'.join(entries[i] for i in order).encode('utf-8')).hexdigest()
+        with self._lock:
+            features = self._loaded.get(roster_hash)
+            if features is not None:
+                self._loaded.move_to_end(roster_hash)
+        if features is not None:
+            self._touch(roster_hash)
+            return features, 'memory', order
+        
+        source = 'disk'
+        features = self.load(roster_hash)
+        if features is None:
+            features = RosterFeatures.build([personnel[i] for i in order], mbti_engine)
+            self.save(roster_hash, features)
+            source = 'built'
+        
+        with self._lock:
+            self._loaded[roster_hash] = features
+            while len(self._loaded) > self.memory_slots:
+                self._loaded.popitem(last=False)
+        return features, source, order
+
+class TeamSweepEngine:
+    """Deterministic what-if evaluation of team size, budget and objective weights"""
+    
+    COLUMNS = ['teamSize', 'budgetCap', 'weights', 'feasible', 'members', 'performance',
+               'mbtiCompatibility', 'diversity', 'skillCoverage', 'cost', 'objective']
+    
+    def __init__(self, features: RosterFeatures, names: List[str], required_skills: List[str],
+                 available: Optional[np.ndarray] = None):
+        self.features = features
+        self.names = names
+        self.required_bits = features.skill_mask(required_skills)
+        self.required_total = len(set(required_skills))
+        self.available = available if available is not None else np.ones(features.size, dtype=bool)
+    
+    def sweep(self, team_sizes: List[int], budget_caps: List[Optional[float]], weights: List[Dict[str, float]]) -> Dict[str, Any]:
+        """Evaluate every grid point and return a compact column/row table"""
+        rows = []
+        for weight in weights:
+            for budget_cap in budget_caps:
+                for team_size in team_sizes:
+                    rows.append(self._evaluate_point(team_size, budget_cap, weight))
+        return {'columns': self.COLUMNS, 'rows': rows}
+    
+    def _evaluate_point(self, team_size: int, budget_cap: Optional[float], weight: Dict[str, float]) -> List[Any]:
+        """Greedily build the best team for one grid point"""
+        f = self.features
+        selected = np.zeros(f.size, dtype=bool)
+        type_counts = np.zeros(len(f.mbti_types))
+        experience_present = np.zeros(len(f.experience_levels), dtype=bool)
+        covered = np.zeros(f.skill_bits.shape[1], dtype=np.uint8)
+        perf_sum = compat_sum = cost = 0.0
+        metrics = (0.0, 1.0, 0.5, 0.0, 0.0)
+        
+        for size in range(1, team_size + 1):
+            candidates = ~selected & self.available
+            if budget_cap is not None:
+                candidates &= self._affordable(selected, size, team_size, cost, budget_cap)
+            if not candidates.any():
+                return [team_size, budget_cap, weight, False, [], None, None, None, None, None, None]
+            
+            performance = (perf_sum + f.skill_scores) / size
+            pairs = size * (size - 1) / 2
+            pair_gain = f.type_compatibility[f.mbti_codes] @ type_counts
+            compatibility = (compat_sum + pair_gain) / pairs if pairs else np.ones(f.size)
+            
+            new_covered = f.skill_bits | covered
+            skill_diversity = np.minimum(np.bitwise_count(new_covered).sum(axis=1) / 10, 1.0)
+            if size > 1:
+                exp_diversity = (experience_present.sum() + ~experience_present[f.experience_codes]) / 4
+                mbti_diversity = ((type_counts > 0).sum() + (type_counts[f.mbti_codes] == 0)) / size
+                diversity = (exp_diversity + skill_diversity + mbti_diversity) / 3
+            else:
+                diversity = np.full(f.size, 0.5)
+            if self.required_total:
+                coverage = np.bitwise_count(new_covered & self.required_bits).sum(axis=1) / self.required_total
+            else:
+                coverage = np.ones(f.size)
+            
+            objective = (weight['performance'] * performance + weight['mbtiCompatibility'] * compatibility
+                         + weight['diversity'] * diversity + weight['skillCoverage'] * coverage)
+            best = int(np.argmax(np.where(candidates, objective, -np.inf)))
+            
+            selected[best] = True
+            perf_sum += f.skill_scores[best]
+            compat_sum += pair_gain[best]
+            type_counts[f.mbti_codes[best]] += 1
+            experience_present[f.experience_codes[best]] = True
+            covered = new_covered[best]
+            cost += f.rates[best]
+            metrics = (performance[best], compatibility[best], diversity[best], coverage[best], objective[best])
+        
+        performance, compatibility, diversity, coverage, objective = (round(float(m), 4) for m in metrics)
+        members = [self.names[i] for i in np.flatnonzero(selected)]
+        return [team_size, budget_cap, weight, True, members, performance, compatibility,
+                diversity, coverage, round(float(cost), 2), objective]
+    
+    def _affordable(self, selected: np.ndarray, size: int, team_size: int, cost: float, budget_cap: float) -> np.ndarray:
+        """Candidates that still leave room to fill the remaining slots with the cheapest people"""
+        f = self.features
+        still_needed = team_size - size
+        # Only people who are free for the project can fill the remaining slots
+        remaining_rates = np.sort(f.rates[~selected & self.available])
+        if still_needed == 0:
+            return cost + f.rates <= budget_cap
+        if len(remaining_rates) <= still_needed:
+            return np.zeros(f.size, dtype=bool)
+        cheapest = remaining_rates[:still_needed].sum()
+        threshold = remaining_rates[still_needed - 1]
+        # A candidate that is itself among the cheapest frees up the next-cheapest slot
+        lookahead = np.where(f.rates <= threshold, cheapest + remaining_rates[still_needed] - f.rates, cheapest)
+        return cost + f.rates + lookahead <= budget_cap
+
 class Real4AgentSystem:
     """Real 4-agent system with true specialization and sequential processing"""
     
-    def __init__(self, websocket_manager):
+    def __init__(self, websocket_manager, state: Optional['SharedStateBackend'] = None,
+                 router: Optional[ModelRouter] = None):
         self.websocket_manager = websocket_manager
-        self.progress_tracker = RealAgentProgressTracker(websocket_manager)
-        self.llm = get_gemini_llm()
+        self.state = state
+        self.router = router or model_router
+        self.router.validate_credentials()
         self.mbti_engine = MBTICompatibilityEngine()
         
-        # Create 4 truly specialized agents
-        self.hr_skills_analyst = self._create_hr_skills_analyst()
-        self.psychology_expert = self._create_psychology_expert()
-        self.tech_architect = self._create_tech_architect()
-        self.executive_strategist = self._create_executive_strategist()
+        # 4 truly specialized agents per routed model; fallback models are built on first use
+        self.agent_factories = {
+            'hrSkillsAnalyst': self._create_hr_skills_analyst,
+            'psychologyExpert': self._create_psychology_expert,
+            'techArchitect': self._create_tech_architect,
+            'executiveStrategist': self._create_executive_strategist
+        }
+        self._agents: Dict[tuple, Agent] = {}
+        for phase, route in self.router.config.phases.items():
+            if phase in self.agent_factories and route.models:
+                self._agents[(phase, route.models[0])] = self.agent_factories[phase](
+                    self.router.llm_for(self.router.specs[route.models[0]])
+                )
         
-        logger.info("✅ 4 Real Specialized Agents initialized with Gemini")
+        logger.info("✅ 4 Real Specialized Agents initialized with per-phase model routing")
 
-    def _create_hr_skills_analyst(self):
+    def _create_hr_skills_analyst(self, llm: LLM):
         """Agent focused ONLY on skills and experience assessment"""
         return Agent(
             role='HR Skills Assessment Specialist',
@@ -260,10 +1009,10 @@ class Real4AgentSystem:
             You do NOT analyze personality or team dynamics - that's for other specialists.""",
             verbose=True,
             allow_delegation=False,
-            llm=self.llm
+            llm=llm
         )
 
-    def _create_psychology_expert(self):
+    def _create_psychology_expert(self, llm: LLM):
         """Agent focused ONLY on MBTI and team psychology"""
         return Agent(
             role='Organizational Psychology and MBTI Expert',
@@ -273,10 +1022,10 @@ class Real4AgentSystem:
             and optimal team psychological composition. You do NOT assess technical skills.""",
             verbose=True,
             allow_delegation=False,
-            llm=self.llm
+            llm=llm
         )
 
-    def _create_tech_architect(self):
+    def _create_tech_architect(self, llm: LLM):
         """Agent focused ONLY on technical architecture and project feasibility"""
         return Agent(
             role='Senior Technical Architect',
@@ -286,10 +1035,10 @@ class Real4AgentSystem:
             You assess if teams can deliver technically complex solutions.""",
             verbose=True,
             allow_delegation=False,
-            llm=self.llm
+            llm=llm
         )
 
-    def _create_executive_strategist(self):
+    def _create_executive_strategist(self, llm: LLM):
         """Agent focused ONLY on business strategy and final optimization"""
         return Agent(
             role='Executive Strategic Business Advisor',
@@ -299,40 +1048,66 @@ class Real4AgentSystem:
             budget constraints, timeline, and ROI.""",
             verbose=True,
             allow_delegation=False,
-            llm=self.llm
+            llm=llm
         )
 
-    async def execute_sequential_analysis(self, requirements: ProjectRequirements, personnel: List[Person]) -> Dict[str, Any]:
-        """Execute true sequential analysis with each agent building on previous results"""
+    def create_tracker(self, run_id: Optional[str] = None) -> RealAgentProgressTracker:
+        """Fresh progress tracker for one run, so concurrent runs never share agent state"""
+        return RealAgentProgressTracker(self.websocket_manager, self.state, run_id)
+
+    async def execute_sequential_analysis(self, requirements: ProjectRequirements, personnel: List[Person],
+                                          tracker: Optional[RealAgentProgressTracker] = None) -> tuple:
+        """Execute true sequential analysis with each agent building on previous results.
+
+        Returns (final results, per-phase outputs, per-phase seconds) for this run only.
+        """
         
-        await self.progress_tracker.initialize_all_agents()
+        if self.router.config.runDeadline:
+            RUN_DEADLINE.set(time.monotonic() + self.router.config.runDeadline)
+        tracker = tracker or self.create_tracker()
+        await tracker.initialize_all_agents()
         
+        timings = {}
         try:
             # PHASE 1: HR Skills Analysis (Independent)
-            await self.progress_tracker.update_agent('hrSkillsAnalyst', 'running', 25, 'Analyzing technical skills and experience...')
+            await tracker.update_agent('hrSkillsAnalyst', 'running', 25, 'Analyzing technical skills and experience...')
+            started = time.perf_counter()
             hr_results = await self._phase1_hr_skills_analysis(requirements, personnel)
-            await self.progress_tracker.update_agent('hrSkillsAnalyst', 'completed', 100, 'Skills assessment complete', hr_results)
+            timings['hrSkillsAnalyst'] = round(time.perf_counter() - started, 4)
+            await tracker.update_agent('hrSkillsAnalyst', 'completed', 100, 'Skills assessment complete', hr_results)
             
             # PHASE 2: Psychology Analysis (Uses HR results)
-            await self.progress_tracker.update_agent('psychologyExpert', 'running', 25, 'Analyzing MBTI compatibility and team dynamics...')
+            await tracker.update_agent('psychologyExpert', 'running', 25, 'Analyzing MBTI compatibility and team dynamics...')
+            started = time.perf_counter()
             psych_results = await self._phase2_psychology_analysis(personnel, hr_results)
-            await self.progress_tracker.update_agent('psychologyExpert', 'completed', 100, 'Psychology analysis complete', psych_results)
+            timings['psychologyExpert'] = round(time.perf_counter() - started, 4)
+            await tracker.update_agent('psychologyExpert', 'completed', 100, 'Psychology analysis complete', psych_results)
             
             # PHASE 3: Technical Architecture (Uses HR + Psychology results)
-            await self.progress_tracker.update_agent('techArchitect', 'running', 25, 'Evaluating technical feasibility...')
+            await tracker.update_agent('techArchitect', 'running', 25, 'Evaluating technical feasibility...')
+            started = time.perf_counter()
             tech_results = await self._phase3_technical_analysis(requirements, hr_results, psych_results)
-            await self.progress_tracker.update_agent('techArchitect', 'completed', 100, 'Technical evaluation complete', tech_results)
+            timings['techArchitect'] = round(time.perf_counter() - started, 4)
+            await tracker.update_agent('techArchitect', 'completed', 100, 'Technical evaluation complete', tech_results)
             
             # PHASE 4: Executive Strategy (Uses all previous results)
-            await self.progress_tracker.update_agent('executiveStrategist', 'running', 25, 'Creating business-optimized recommendations...')
+            await tracker.update_agent('executiveStrategist', 'running', 25, 'Creating business-optimized recommendations...')
+            started = time.perf_counter()
             final_results = await self._phase4_executive_synthesis(requirements, personnel, hr_results, psych_results, tech_results)
-            await self.progress_tracker.update_agent('executiveStrategist', 'completed', 100, 'Strategic recommendations complete', final_results)
+            timings['executiveStrategist'] = round(time.perf_counter() - started, 4)
+            await tracker.update_agent('executiveStrategist', 'completed', 100, 'Strategic recommendations complete', final_results)
             
-            return final_results
+            phase_outputs = {
+                'hrSkillsAnalyst': hr_results,
+                'psychologyExpert': psych_results,
+                'techArchitect': tech_results,
+                'executiveStrategist': final_results
+            }
+            return final_results, phase_outputs, timings
             
         except Exception as e:
             logger.error(f"Sequential analysis failed: {str(e)}")
-            await self.progress_tracker.set_all_agents_error(f"Analysis failed: {str(e)}")
+            await tracker.set_all_agents_error(f"Analysis failed: {str(e)}")
             raise
 
     async def _phase1_hr_skills_analysis(self, requirements: ProjectRequirements, personnel: List[Person]) -> Dict[str, Any]:
@@ -350,26 +1125,25 @@ class Real4AgentSystem:
             
             PERSONNEL TO ANALYZE: {personnel_data}
             
-            For each person, provide:
-            1. Technical skill assessment (1-10 scale for each required skill)
-            2. Experience level evaluation (junior/mid/senior/lead appropriateness)
-            3. Skill gaps identification
-            4. Role recommendations based purely on technical capability
+            Score each person 1-10 on each required skill, weighing stated skills and experience depth,
+            and list required skills nobody covers well.
             
-            OUTPUT: Detailed technical assessment for each person with numerical scores.
+            OUTPUT: ONLY this JSON object, no prose or code fences:
+            {HRPhaseOutput.SCHEMA_HINT}
             """,
-            agent=self.hr_skills_analyst,
-            expected_output="Technical skills assessment with numerical scores for each person"
+            expected_output="Compact JSON object with per-person per-skill scores"
         )
         
-        crew = Crew(agents=[self.hr_skills_analyst], tasks=[hr_task], verbose=False)
-        result = await asyncio.to_thread(crew.kickoff)
+        result, parsed, output_status, model = await self._kickoff_structured('hrSkillsAnalyst', hr_task, HRPhaseOutput)
         
         # Process results into structured format
         return {
             'analysis': str(result),
-            'personnel_scores': self._extract_skill_scores(personnel, str(result)),
-            'skill_gaps': self._identify_skill_gaps(requirements, personnel)
+            'personnel_scores': self._extract_skill_scores(personnel, parsed, requirements.skills),
+            'skill_gaps': self._identify_skill_gaps(requirements, personnel),
+            'free_capacity': self._assess_free_capacity(requirements, personnel),
+            'output_status': output_status,
+            'model': model
         }
 
     async def _phase2_psychology_analysis(self, personnel: List[Person], hr_results: Dict) -> Dict[str, Any]:
@@ -385,29 +1159,26 @@ class Real4AgentSystem:
             
             PREVIOUS HR ANALYSIS: {hr_results.get('analysis', 'No previous analysis')}
             
-            Analyze:
-            1. MBTI compatibility between different team member combinations
-            2. Potential personality conflicts and communication challenges
-            3. Leadership dynamics and decision-making styles
-            4. Team motivation and collaboration patterns
-            5. Stress response and conflict resolution capabilities
-            
-            Use MBTI research to predict team dynamics and identify optimal personality combinations.
+            Flag only the pairs of people whose MBTI combination carries a real risk of communication
+            challenges or conflict, and give up to 3 short team dynamics predictions.
             
-            OUTPUT: MBTI-based team compatibility analysis with specific personality insights.
+            OUTPUT: ONLY this JSON object, no prose or code fences:
+            {PsychologyPhaseOutput.SCHEMA_HINT}
             """,
-            agent=self.psychology_expert,
-            expected_output="MBTI compatibility analysis with team dynamics predictions"
+            expected_output="Compact JSON object with pairwise risk flags"
         )
         
-        crew = Crew(agents=[self.psychology_expert], tasks=[psych_task], verbose=False)
-        result = await asyncio.to_thread(crew.kickoff)
+        result, parsed, output_status, model = await self._kickoff_structured('psychologyExpert', psych_task, PsychologyPhaseOutput)
         
         return {
             'analysis': str(result),
             'mbti_compatibility': self._calculate_mbti_scores(personnel),
-            'potential_conflicts': self.mbti_engine.identify_potential_conflicts(personnel),
-            'team_dynamics_predictions': self._extract_team_dynamics(str(result))
+            # Pool-wide conflicts stay aggregated; per-pair detail is built only for selected teams
+            'conflict_histogram': self.mbti_engine.conflict_histogram(personnel),
+            'pair_risks': self._extract_pair_risks(personnel, parsed),
+            'team_dynamics_predictions': self._extract_team_dynamics(parsed),
+            'output_status': output_status,
+            'model': model
         }
 
     async def _phase3_technical_analysis(self, requirements: ProjectRequirements, hr_results: Dict, psych_results: Dict) -> Dict[str, Any]:
@@ -428,29 +1199,29 @@ class Real4AgentSystem:
             HR SKILLS ANALYSIS: {hr_results.get('analysis', '')}
             PSYCHOLOGY ANALYSIS: {psych_results.get('analysis', '')}
             
-            Technical Assessment:
-            1. Can the available skills deliver this project type?
-            2. What are the technical risks and mitigation strategies?
-            3. Architecture complexity vs team capability
-            4. Technical leadership requirements
-            5. Knowledge transfer and mentoring needs
-            
-            Consider both technical skills (from HR) and team dynamics (from Psychology) for delivery capability.
+            Considering both technical skills (from HR) and team dynamics (from Psychology), rate delivery
+            feasibility from 0 to 1 and list up to 3 short technical risks.
             
-            OUTPUT: Technical feasibility assessment with risk analysis.
+            OUTPUT: ONLY this JSON object, no prose or code fences:
+            {TechnicalPhaseOutput.SCHEMA_HINT}
             """,
-            agent=self.tech_architect,
-            expected_output="Technical feasibility analysis with delivery capability assessment"
+            expected_output="Compact JSON object with feasibility and technical risks"
         )
         
-        crew = Crew(agents=[self.tech_architect], tasks=[tech_task], verbose=False)
-        result = await asyncio.to_thread(crew.kickoff)
+        result, parsed, output_status, model = await self._kickoff_structured('techArchitect', tech_task, TechnicalPhaseOutput)
+        
+        technical_risks = self._identify_technical_risks(requirements, hr_results)
+        if parsed:
+            technical_risks.extend(risk for risk in parsed.risks[:3] if risk not in technical_risks)
         
         return {
             'analysis': str(result),
             'technical_feasibility': self._assess_technical_feasibility(requirements, hr_results),
+            'ai_feasibility': parsed.feasibility if parsed else None,
             'project_complexity': project_complexity,
-            'technical_risks': self._identify_technical_risks(requirements, hr_results)
+            'technical_risks': technical_risks,
+            'output_status': output_status,
+            'model': model
         }
 
     async def _phase4_executive_synthesis(self, requirements: ProjectRequirements, personnel: List[Person], 
@@ -476,31 +1247,27 @@ class Real4AgentSystem:
             
             TECHNICAL ANALYSIS: {tech_results.get('analysis', '')}
             
-            EXECUTIVE DECISIONS REQUIRED:
-            1. Rank top 3 team compositions considering ALL factors
-            2. Business rationale for each recommendation
-            3. Risk mitigation strategies
-            4. Budget and timeline implications
-            5. Success probability assessments
-            
-            Make final business-optimized team recommendations that balance technical capability, 
-            psychological compatibility, and business objectives.
+            Summarize in at most 120 words the business-optimal team strategy balancing technical capability,
+            psychological compatibility, budget and timeline, plus up to 3 priorities for risk mitigation.
             
-            OUTPUT: Executive summary with ranked team recommendations and business justification.
+            OUTPUT: ONLY this JSON object, no prose or code fences:
+            {ExecutivePhaseOutput.SCHEMA_HINT}
             """,
-            agent=self.executive_strategist,
-            expected_output="Executive team recommendations with business justification"
+            expected_output="Compact JSON object with an executive summary"
         )
         
-        crew = Crew(agents=[self.executive_strategist], tasks=[exec_task], verbose=False)
-        result = await asyncio.to_thread(crew.kickoff)
+        result, parsed, output_status, model = await self._kickoff_structured('executiveStrategist', exec_task, ExecutivePhaseOutput)
         
         # Generate final structured recommendations
         recommendations = self._generate_final_recommendations(personnel, requirements, hr_results, psych_results, tech_results)
         
+        ai_analysis = str(result)
+        if parsed:
+            ai_analysis = '\n'.join([parsed.summary] + [f"- {priority}" for priority in parsed.priorities])
+        
         return {
             'recommendations': recommendations,
-            'aiAnalysis': str(result),
+            'aiAnalysis': ai_analysis,
             'metadata': {
                 'totalCandidates': len(personnel),
                 'confidence': 0.94,  # Higher confidence due to 4-agent analysis
@@ -508,10 +1275,116 @@ class Real4AgentSystem:
                 'aiAgentsUsed': 4,
                 'analysisDepth': 'comprehensive_specialized_sequential',
                 'aiEngine': 'CrewAI + Google Gemini',
-                'mbtiEnabled': True
+                'mbtiEnabled': True,
+                'structuredOutputs': {
+                    'hrSkillsAnalyst': hr_results.get('output_status'),
+                    'psychologyExpert': psych_results.get('output_status'),
+                    'techArchitect': tech_results.get('output_status'),
+                    'executiveStrategist': output_status
+                },
+                'modelRouting': {
+                    'hrSkillsAnalyst': hr_results.get('model'),
+                    'psychologyExpert': psych_results.get('model'),
+                    'techArchitect': tech_results.get('model'),
+                    'executiveStrategist': model
+                }
             }
         }
 
+    async def _kickoff(self, agent: Agent, task: Task) -> str:
+        """Run a single-agent crew on the LLM executor and return its text output"""
+        crew = Crew(agents=[agent], tasks=[task], verbose=False)
+        profiler = ACTIVE_PROFILER.get()
+        call = functools.partial(profiler.time_call, crew.kickoff) if profiler else crew.kickoff
+        context = contextvars.copy_context()
+        result = await asyncio.get_running_loop().run_in_executor(llm_executor, context.run, call)
+        return str(result)
+
+    async def _kickoff_structured(self, phase: str, task: Task, schema: type) -> tuple:
+        """Run a phase task on its routed model; the reply must be JSON for schema, with one bounded repair retry.
+
+        Returns (raw text, parsed model or None, 'parsed' | 'repaired' | 'fallback' | 'deterministic', model name or None).
+        """
+        usage = {'started': time.perf_counter(), 'cost': 0.0}
+        result, spec = await self._kickoff_routed(phase, task, usage)
+        if spec is None:
+            return '', None, 'deterministic', None
+        try:
+            return result, parse_phase_output(result, schema), 'parsed', spec.name
+        except ValueError as e:
+            error = str(e)
+        
+        logger.warning(f"{phase} returned malformed JSON from {spec.name}, requesting one repair: {error[:200]}")
+        repair_task = Task(
+            description=f"""
+            Your previous response did not match the required JSON schema.
+            
+            ERROR: {error[:MAX_REPAIR_ECHO_CHARS]}
+            
+            PREVIOUS RESPONSE: {result[:MAX_REPAIR_ECHO_CHARS]}
+            
+            OUTPUT: ONLY the corrected JSON object, no prose or code fences:
+            {schema.SCHEMA_HINT}
+            """,
+            expected_output="A single valid JSON object"
+        )
+        repaired, repair_spec = await self._kickoff_routed(phase, repair_task, usage)
+        if repair_spec is None:
+            logger.warning(f"{phase} has no budget left for a repair, using deterministic fallback")
+            return result, None, 'fallback', spec.name
+        try:
+            return repaired, parse_phase_output(repaired, schema), 'repaired', repair_spec.name
+        except ValueError as e:
+            logger.warning(f"{phase} repair failed, using deterministic fallback: {str(e)[:200]}")
+            return repaired, None, 'fallback', repair_spec.name
+
+    async def _kickoff_routed(self, phase: str, task: Task, usage: Dict[str, float]) -> tuple:
+        """Run task on the best model that fits the phase budgets, moving down the route on timeouts and errors.
+
+        task is only a template: each attempt runs its own copy, since a timed-out attempt keeps
+        running in its thread and must not share a Task with the next one.
+
+        Returns (text, ModelSpec), or ('', None) when no model fits and the phase should go deterministic.
+        """
+        tried = set()
+        while True:
+            budget = self.router.time_budget(phase, time.perf_counter() - usage['started'])
+            spec = self.router.choose(phase, budget, task.description, usage['cost'], tried)
+            if spec is None:
+                logger.warning(f"No model fits the {phase} budget ({budget:.1f}s left), using deterministic path")
+                return '', None
+            tried.add(spec.name)
+            usage['cost'] += self.router.estimated_cost(spec, task.description)
+            
+            timeout = self.router.call_timeout(phase, spec, budget, tried)
+            started = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(self._invoke_model(phase, spec, task), timeout=timeout)
+            except asyncio.TimeoutError:
+                # The crew thread cannot be interrupted; its late reply is discarded. The real latency
+                # is unknown, so count the timeout double to steer later calls elsewhere
+                self.router.record(spec.name, 2 * (time.perf_counter() - started), ok=False)
+                logger.warning(f"{spec.name} exceeded its {timeout:.1f}s share of the {phase} budget")
+                continue
+            except Exception as e:
+                self.router.record(spec.name, time.perf_counter() - started, ok=False)
+                logger.warning(f"{spec.name} failed during {phase}: {str(e)[:200]}")
+                continue
+            self.router.record(spec.name, time.perf_counter() - started)
+            return result, spec
+
+    async def _invoke_model(self, phase: str, spec: ModelSpec, task: Task) -> str:
+        """Run a fresh copy of the task template with the phase's agent on the routed model"""
+        key = (phase, spec.name)
+        if key not in self._agents:
+            # Building a CrewAI LLM and agent takes long enough to stall the event loop
+            self._agents[key] = await asyncio.to_thread(
+                lambda: self.agent_factories[phase](self.router.llm_for(spec))
+            )
+        agent = self._agents[key]
+        attempt = Task(description=task.description, expected_output=task.expected_output, agent=agent)
+        return await self._kickoff(agent, attempt)
+
     def _format_personnel_for_hr(self, personnel: List[Person]) -> str:
         """Format personnel data for HR skills analysis"""
         formatted = []
@@ -538,17 +1411,32 @@ class Real4AgentSystem:
             """)
         return '\n---\n'.join(formatted)
 
-    def _extract_skill_scores(self, personnel: List[Person], analysis: str) -> Dict:
-        """Extract skill scores from HR analysis"""
-        # Simplified scoring based on experience and skills
+    def _extract_skill_scores(self, personnel: List[Person], hr_output: Optional[HRPhaseOutput],
+                              required_skills: List[str]) -> Dict:
+        """Extract skill scores from HR analysis, falling back to experience heuristics per person"""
+        llm_scores = {}
+        if hr_output:
+            llm_scores = {name.strip().lower(): skills for name, skills in hr_output.scores.items()}
+        
         scores = {}
         for person in personnel:
             exp_multiplier = {'junior': 0.6, 'mid': 0.7, 'senior': 0.9, 'lead': 1.0}.get(person.experience, 0.7)
-            skill_score = min(len(person.skills) * 0.15 + exp_multiplier, 1.0)
+            person_scores = llm_scores.get(person.name.strip().lower(), {})
+            skill_scores = {
+                skill: min(max(person_scores[skill], 1.0), 10.0)
+                for skill in required_skills if skill in person_scores
+            }
+            if skill_scores:
+                skill_score = sum(skill_scores.values()) / len(skill_scores) / 10
+            else:
+                # Simplified scoring based on experience and skills
+                skill_score = min(len(person.skills) * 0.15 + exp_multiplier, 1.0)
             scores[person.name] = {
                 'overall_score': skill_score,
                 'experience_score': exp_multiplier,
-                'skill_count': len(person.skills)
+                'skill_count': len(person.skills),
+                'skill_scores': skill_scores,
+                'source': 'llm' if skill_scores else 'heuristic'
             }
         return scores
 
@@ -562,19 +1450,39 @@ class Real4AgentSystem:
         gaps = required_skills - available_skills
         return list(gaps)
 
+    def _assess_free_capacity(self, requirements: ProjectRequirements, personnel: List[Person]) -> Dict[str, float]:
+        """Free capacity per person over the project window, empty when no window is set"""
+        window = CapacityCalendar.project_window(requirements)
+        if window is None:
+            return {}
+        free = CapacityCalendar(personnel).free_capacity(*window)
+        return {person.name: round(capacity, 4) for person, capacity in zip(personnel, free)}
+
     def _calculate_mbti_scores(self, personnel: List[Person]) -> Dict:
-        """Calculate MBTI compatibility scores"""
+        """Calculate MBTI compatibility scores between the types present in the pool"""
+        types = sorted(self.mbti_engine.count_types(personnel))
         scores = {}
-        for i, person1 in enumerate(personnel):
-            for j, person2 in enumerate(personnel):
-                if i < j:
-                    compatibility = self.mbti_engine.calculate_team_compatibility([person1, person2])
-                    scores[f"{person1.name}-{person2.name}"] = compatibility
+        for i, mbti1 in enumerate(types):
+            for mbti2 in types[i:]:
+                scores[f"{mbti1}-{mbti2}"] = self.mbti_engine.pair_compatibility(mbti1, mbti2)
         return scores
 
-    def _extract_team_dynamics(self, analysis: str) -> List[str]:
+    def _extract_pair_risks(self, personnel: List[Person], psych_output: Optional[PsychologyPhaseOutput]) -> List[Dict]:
+        """Keep pairwise risk flags that refer to people in the roster"""
+        if not psych_output:
+            return []
+        names = {person.name.strip().lower(): person.name for person in personnel}
+        risks = []
+        for flag in psych_output.risks:
+            a, b = names.get(flag.a.strip().lower()), names.get(flag.b.strip().lower())
+            if a and b and a != b:
+                risks.append({'a': a, 'b': b, 'level': flag.level, 'reason': flag.reason})
+        return risks
+
+    def _extract_team_dynamics(self, psych_output: Optional[PsychologyPhaseOutput]) -> List[str]:
         """Extract team dynamics insights from psychology analysis"""
-        # Simplified extraction - in real implementation, use NLP
+        if psych_output and psych_output.dynamics:
+            return psych_output.dynamics[:3]
         dynamics = [
             "Strong collaborative potential identified",
             "Balanced decision-making styles present",
@@ -624,6 +1532,12 @@ class Real4AgentSystem:
         if requirements.timeline and int(requirements.timeline) < 6:
             risks.append("Aggressive timeline may impact quality")
         
+        free_capacity = hr_results.get('free_capacity', {})
+        if free_capacity:
+            available = sum(1 for free in free_capacity.values() if free >= requirements.requiredAllocation)
+            if available < requirements.teamSize:
+                risks.append(f"Only {available} people have {requirements.requiredAllocation:.0%} free capacity in the project window")
+        
         return risks
 
     def _generate_final_recommendations(self, personnel: List[Person], requirements: ProjectRequirements,
@@ -633,7 +1547,8 @@ class Real4AgentSystem:
         
         # Generate 3 different team strategies
         for i in range(3):
-            team_members = self._select_optimal_team(personnel, requirements.teamSize, i, hr_results, psych_results)
+            team_members = self._select_optimal_team(personnel, requirements.teamSize, i, hr_results, psych_results,
+                                                     requirements.requiredAllocation)
             
             if len(team_members) == requirements.teamSize:
                 team_analysis = self._create_comprehensive_team_metrics(team_members, i, hr_results, psych_results, tech_results)
@@ -651,9 +1566,14 @@ class Real4AgentSystem:
         return recommendations
 
     def _select_optimal_team(self, personnel: List[Person], team_size: int, strategy: int, 
-                           hr_results: Dict, psych_results: Dict) -> List[Person]:
+                           hr_results: Dict, psych_results: Dict, required_allocation: float = 0.5) -> List[Person]:
         """Select optimal team using multi-agent insights"""
         
+        # Capacity feasibility: only consider people free enough during the project window
+        free_capacity = hr_results.get('free_capacity', {})
+        if free_capacity:
+            personnel = [p for p in personnel if free_capacity.get(p.name, 0.0) >= required_allocation]
+        
         if strategy == 0:  # Optimal performance team
             # Prioritize high skill scores and good MBTI compatibility
             scored_personnel = []
@@ -664,7 +1584,20 @@ class Real4AgentSystem:
                 scored_personnel.append((total_score, person))
             
             scored_personnel.sort(reverse=True, key=lambda x: x[0])
-            return [person for _, person in scored_personnel[:team_size]]
+            
+            # Avoid pairs the Psychology Expert flagged as high risk unless there is nobody else
+            high_risk = {frozenset((risk['a'], risk['b'])) for risk in psych_results.get('pair_risks', [])
+                         if risk['level'] == 'high'}
+            selected, deferred = [], []
+            for _, person in scored_personnel:
+                if len(selected) == team_size:
+                    break
+                if any(frozenset((person.name, member.name)) in high_risk for member in selected):
+                    deferred.append(person)
+                else:
+                    selected.append(person)
+            selected.extend(deferred[:team_size - len(selected)])
+            return selected
             
         elif strategy == 1:  # Balanced team
             # Balance experience levels and personality types
@@ -717,6 +1650,7 @@ class Real4AgentSystem:
                     "skillMatch": hr_results.get('personnel_scores', {}).get(member.name, {}).get('overall_score', base_score),
                     "experienceScore": hr_results.get('personnel_scores', {}).get(member.name, {}).get('experience_score', base_score),
                     "personalityFit": mbti_compatibility,
+                    "freeCapacity": hr_results.get('free_capacity', {}).get(member.name),
                     "overallScore": base_score
                 }
                 for member in team_members
@@ -813,8 +1747,14 @@ class Real4AgentSystem:
         """Get comprehensive risks from multi-agent analysis"""
         risks = []
         
-        # Psychology-identified risks
-        conflicts = psych_results.get('potential_conflicts', [])
+        # Psychology-identified risks, preferring pair flags within this team
+        member_names = {member.name for member in team_members}
+        flagged = [
+            f"{risk['a']} and {risk['b']}: {risk['reason'] or risk['level'] + ' collaboration risk'}"
+            for risk in sorted(psych_results.get('pair_risks', []), key=lambda r: r['level'] != 'high')
+            if risk['level'] != 'low' and risk['a'] in member_names and risk['b'] in member_names
+        ]
+        conflicts = flagged or self.mbti_engine.identify_potential_conflicts(team_members)
         if conflicts:
             risks.extend(conflicts[:2])  # Limit to top 2 conflicts
         
@@ -834,25 +1774,981 @@ class Real4AgentSystem:
         
         return risks
 
+# Run History Store
+class RunHistoryStore:
+    """Persistent run history in embedded SQLite with compressed payloads"""
+    
+    DIFF_METRICS = ['overallScore', 'performance', 'mbtiCompatibility', 'diversity', 'conflictRisk', 'technicalFeasibility']
+    
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS runs (
+                    run_id TEXT PRIMARY KEY,
+                    created_at TEXT NOT NULL,
+                    completed_at TEXT,
+                    status TEXT NOT NULL,
+                    project_name TEXT,
+                    roster_hash TEXT NOT NULL,
+                    roster_size INTEGER NOT NULL,
+                    requirements TEXT NOT NULL,
+                    timings TEXT,
+                    error TEXT,
+                    payload BLOB
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_runs_created_at ON runs (created_at)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_runs_roster_hash ON runs (roster_hash)")
+        logger.info(f"✅ Run history store ready at {db_path}")
+    
+    @staticmethod
+    def roster_entry(person: Person) -> str:
+        """Canonical JSON form of one person, independent of skill order"""
+        return json.dumps({**person.dict(), 'skills': sorted(person.skills)}, sort_keys=True, separators=(',', ':'), default=str)
+    
+    @staticmethod
+    def compute_roster_hash(personnel: List[Person]) -> str:
+        """Order-insensitive hash of the personnel roster"""
+        entries = sorted(RunHistoryStore.roster_entry(person) for person in personnel)
+        return hashlib.sha256('\n'.join(entries).encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def _compress(data: Any) -> bytes:
+        return zlib.compress(json.dumps(data, separators=(',', ':'), default=str).encode('utf-8'), 6)
+    
+    @staticmethod
+    def _decompress(blob: Optional[bytes]) -> Any:
+        if not blob:
+            return None
+        return json.loads(zlib.decompress(blob).decode('utf-8'))
+    
+    def create_run(self, run_id: str, requirements: ProjectRequirements, personnel: List[Person],
+                   roster_hash: Optional[str] = None) -> str:
+        """Record a new run in 'running' state and return its roster hash"""
+        roster_hash = roster_hash or self.compute_roster_hash(personnel)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO runs (run_id, created_at, status, project_name, roster_hash, roster_size, requirements) "
+                "VALUES (?, ?, 'running', ?, ?, ?, ?)",
+                (run_id, datetime.now().isoformat(), requirements.projectName, roster_hash,
+                 len(personnel), json.dumps(requirements.dict(), default=str))
+            )
+        return roster_hash
+    
+    def complete_run(self, run_id: str, phase_outputs: Dict[str, Any], result: Dict[str, Any], timings: Dict[str, float]):
+        """Store phase outputs, final recommendations and timings for a finished run"""
+        payload = self._compress({'phases': phase_outputs, 'result': result})
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE runs SET status = 'completed', completed_at = ?, timings = ?, payload = ? WHERE run_id = ?",
+                (datetime.now().isoformat(), json.dumps(timings), payload, run_id)
+            )
+    
+    def fail_run(self, run_id: str, error: str):
+        """Mark a run as failed"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE runs SET status = 'error', completed_at = ?, error = ? WHERE run_id = ?",
+                (datetime.now().isoformat(), error, run_id)
+            )
+    
+    def _row_summary(self, row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            'runId': row['run_id'],
+            'createdAt': row['created_at'],
+            'completedAt': row['completed_at'],
+            'status': row['status'],
+            'projectName': row['project_name'],
+            'rosterHash': row['roster_hash'],
+            'rosterSize': row['roster_size'],
+            'timings': json.loads(row['timings']) if row['timings'] else {},
+            'error': row['error']
+        }
+    
+    def get_run(self, run_id: str, include_phases: bool = True) -> Optional[Dict[str, Any]]:
+        """Fetch a single run with its decompressed result"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        if row is None:
+            return None
+        run = self._row_summary(row)
+        run['requirements'] = json.loads(row['requirements'])
+        payload = self._decompress(row['payload']) or {}
+        run['result'] = payload.get('result')
+        if include_phases:
+            run['phases'] = payload.get('phases', {})
+        return run
+    
+    def list_runs(self, limit: int = 20, offset: int = 0, roster_hash: Optional[str] = None) -> Dict[str, Any]:
+        """List run summaries, newest first, without decompressing payloads"""
+        where, params = ("WHERE roster_hash = ?", [roster_hash]) if roster_hash else ("", [])
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM runs {where}", params).fetchone()[0]
+            rows = self._conn.execute(
+                "SELECT run_id, created_at, completed_at, status, project_name, roster_hash, roster_size, timings, error "
+                f"FROM runs {where} ORDER BY created_at DESC LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            ).fetchall()
+        return {
+            'runs': [self._row_summary(row) for row in rows],
+            'total': total,
+            'limit': limit,
+            'offset': offset
+        }
+    
+    def diff_runs(self, run_id_a: str, run_id_b: str) -> Optional[Dict[str, Any]]:
+        """Compare requirements, recommended teams, metrics and timings of two runs"""
+        run_a = self.get_run(run_id_a, include_phases=False)
+        run_b = self.get_run(run_id_b, include_phases=False)
+        if run_a is None or run_b is None:
+            return None
+        
+        requirements_changes = {
+            key: {'a': run_a['requirements'].get(key), 'b': run_b['requirements'].get(key)}
+            for key in sorted(set(run_a['requirements']) | set(run_b['requirements']))
+            if run_a['requirements'].get(key) != run_b['requirements'].get(key)
+        }
+        
+        recs_a = {rec['rank']: rec for rec in (run_a['result'] or {}).get('recommendations', [])}
+        recs_b = {rec['rank']: rec for rec in (run_b['result'] or {}).get('recommendations', [])}
+        recommendations = []
+        for rank in sorted(set(recs_a) | set(recs_b)):
+            team_a = recs_a.get(rank, {}).get('team', {})
+            team_b = recs_b.get(rank, {}).get('team', {})
+            members_a = {m['person']['name'] for m in team_a.get('members', [])}
+            members_b = {m['person']['name'] for m in team_b.get('members', [])}
+            recommendations.append({
+                'rank': rank,
+                'added': sorted(members_b - members_a),
+                'removed': sorted(members_a - members_b),
+                'unchanged': sorted(members_a & members_b),
+                'metrics': {
+                    metric: {
+                        'a': team_a.get(metric),
+                        'b': team_b.get(metric),
+                        'delta': round(team_b[metric] - team_a[metric], 4) if metric in team_a and metric in team_b else None
+                    }
+                    for metric in self.DIFF_METRICS
+                }
+            })
+        
+        timings = {
+            phase: {
+                'a': run_a['timings'].get(phase),
+                'b': run_b['timings'].get(phase),
+                'delta': round(run_b['timings'][phase] - run_a['timings'][phase], 4)
+                if phase in run_a['timings'] and phase in run_b['timings'] else None
+            }
+            for phase in sorted(set(run_a['timings']) | set(run_b['timings']))
+        }
+        
+        return {
+            'a': {'runId': run_a['runId'], 'createdAt': run_a['createdAt'], 'status': run_a['status']},
+            'b': {'runId': run_b['runId'], 'createdAt': run_b['createdAt'], 'status': run_b['status']},
+            'sameRoster': run_a['rosterHash'] == run_b['rosterHash'],
+            'requirementsChanges': requirements_changes,
+            'recommendations': recommendations,
+            'timings': timings
+        }
+
+run_store = RunHistoryStore(os.getenv("RUN_STORE_PATH", "runs.db"))
+
+# Shared State
+PROGRESS_CHANNEL = 'progress'
+JOB_STATUS_TTL = 24 * 3600
+
+class SharedStateBackend(ABC):
+    """Key/value state with TTLs plus a pub/sub relay, shared by every worker process"""
+    
+    name = 'base'
+    shared = False  # True when other processes see the same state
+    
+    async def start(self):
+        pass
+    
+    async def close(self):
+        pass
+    
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        pass
+    
+    @abstractmethod
+    async def set(self, key: str, value: str, ttl: Optional[float] = None):
+        pass
+    
+    @abstractmethod
+    async def set_if_absent(self, key: str, value: str, ttl: float) -> bool:
+        """Atomically claim key; returns False if another owner holds it"""
+    
+    @abstractmethod
+    async def delete_if_equals(self, key: str, value: str):
+        """Release key only if it still holds value"""
+    
+    @abstractmethod
+    async def publish(self, channel: str, payload: str):
+        pass
+    
+    @abstractmethod
+    async def subscribe(self, channel: str, callback):
+        """Register an async callback(payload) for every message on channel, from any worker"""
+    
+    async def set_job(self, run_id: str, status: Dict[str, Any]):
+        await self.set(f"job:{run_id}", json.dumps(status, default=str), JOB_STATUS_TTL)
+    
+    async def get_job(self, run_id: str) -> Optional[Dict[str, Any]]:
+        raw = await self.get(f"job:{run_id}")
+        return json.loads(raw) if raw else None
+
+class InProcessStateBackend(SharedStateBackend):
+    """Default single-worker backend: plain dicts and direct callback delivery"""
+    
+    name = 'memory'
+    
+    def __init__(self):
+        self._values: Dict[str, tuple] = {}  # key -> (value, expires_at)
+        self._subscribers: Dict[str, List] = {}
+        self._writes = 0
+    
+    def _live(self, key: str) -> Optional[str]:
+        entry = self._values.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= time.time():
+            del self._values[key]
+            return None
+        return entry[0]
+    
+    async def get(self, key: str) -> Optional[str]:
+        return self._live(key)
+    
+    async def set(self, key: str, value: str, ttl: Optional[float] = None):
+        self._values[key] = (value, time.time() + ttl if ttl else None)
+        self._writes += 1
+        if self._writes % 1024 == 0:
+            for stale in [k for k, (_, expires_at) in self._values.items() if expires_at and expires_at <= time.time()]:
+                del self._values[stale]
+    
+    async def set_if_absent(self, key: str, value: str, ttl: float) -> bool:
+        if self._live(key) is not None:
+            return False
+        await self.set(key, value, ttl)
+        return True
+    
+    async def delete_if_equals(self, key: str, value: str):
+        if self._live(key) == value:
+            del self._values[key]
+    
+    async def publish(self, channel: str, payload: str):
+        for callback in self._subscribers.get(channel, []):
+            await callback(payload)
+    
+    async def subscribe(self, channel: str, callback):
+        self._subscribers.setdefault(channel, []).append(callback)
+
+class SQLiteStateBackend(SharedStateBackend):
+    """Shared state in a local SQLite file for `uvicorn --workers N` on one host.
+
+    Pub/sub is an append-only event table that each worker polls; events are pruned
+    after EVENT_RETENTION_SECONDS.
+    """
+    
+    name = 'sqlite'
+    shared = True
+    EVENT_RETENTION_SECONDS = 60
+    
+    def __init__(self, db_path: str, poll_interval: float = 0.05):
+        self.db_path = db_path
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    channel TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+        self._subscribers: Dict[str, List] = {}
+        self._last_event_id = 0
+        self._poller: Optional[asyncio.Task] = None
+        self._publishes = 0
+    
+    async def start(self):
+        # Only relay events published after this worker came up
+        with self._lock:
+            self._last_event_id = self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM events").fetchone()[0]
+        self._poller = asyncio.create_task(self._poll_events())
+    
+    async def close(self):
+        if self._poller:
+            self._poller.cancel()
+            self._poller = None
+    
+    def _get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM kv WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)", (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+    
+    def _set(self, key: str, value: str, ttl: Optional[float]):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+                               (key, value, time.time() + ttl if ttl else None))
+    
+    def _set_if_absent(self, key: str, value: str, ttl: float) -> bool:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM kv WHERE key = ? AND expires_at <= ?", (key, now))
+            cursor = self._conn.execute("INSERT OR IGNORE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+                                        (key, value, now + ttl))
+        return cursor.rowcount == 1
+    
+    def _delete_if_equals(self, key: str, value: str):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM kv WHERE key = ? AND value = ?", (key, value))
+    
+    def _publish(self, channel: str, payload: str):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("INSERT INTO events (channel, payload, created_at) VALUES (?, ?, ?)", (channel, payload, now))
+            self._publishes += 1
+            if self._publishes % 256 == 0:
+                self._conn.execute("DELETE FROM events WHERE created_at < ?", (now - self.EVENT_RETENTION_SECONDS,))
+                self._conn.execute("DELETE FROM kv WHERE expires_at <= ?", (now,))
+    
+    def _fetch_events(self) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT id, channel, payload FROM events WHERE id > ? ORDER BY id", (self._last_event_id,)
+            ).fetchall()
+    
+    async def _poll_events(self):
+        while True:
+            try:
+                rows = await asyncio.to_thread(self._fetch_events)
+            except sqlite3.Error as e:
+                logger.warning(f"State event poll failed: {str(e)}")
+                rows = []
+            for event_id, channel, payload in rows:
+                self._last_event_id = event_id
+                for callback in self._subscribers.get(channel, []):
+                    try:
+                        await callback(payload)
+                    except Exception as e:
+                        logger.warning(f"State event delivery failed: {str(e)}")
+            await asyncio.sleep(self.poll_interval)
+    
+    async def get(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self._get, key)
+    
+    async def set(self, key: str, value: str, ttl: Optional[float] = None):
+        await asyncio.to_thread(self._set, key, value, ttl)
+    
+    async def set_if_absent(self, key: str, value: str, ttl: float) -> bool:
+        return await asyncio.to_thread(self._set_if_absent, key, value, ttl)
+    
+    async def delete_if_equals(self, key: str, value: str):
+        await asyncio.to_thread(self._delete_if_equals, key, value)
+    
+    async def publish(self, channel: str, payload: str):
+        await asyncio.to_thread(self._publish, channel, payload)
+    
+    async def subscribe(self, channel: str, callback):
+        self._subscribers.setdefault(channel, []).append(callback)
+
+class RedisStateBackend(SharedStateBackend):
+    """Shared state in Redis (or any Redis-protocol server, including over a Unix socket) for multi-host deployments"""
+    
+    name = 'redis'
+    shared = True
+    RELEASE_SCRIPT = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+    
+    def __init__(self, url: str, prefix: str = 'teamforge:'):
+        try:
+            import redis.asyncio as redis_asyncio
+        except ImportError:
+            raise ValueError("The redis state backend requires the redis package to be installed")
+        self.prefix = prefix
+        self._redis = redis_asyncio.from_url(url, decode_responses=True)
+        self._pubsub = self._redis.pubsub()
+        self._subscribers: Dict[str, List] = {}
+        self._listener: Optional[asyncio.Task] = None
+    
+    async def start(self):
+        self._listener = asyncio.create_task(self._listen())
+    
+    async def close(self):
+        if self._listener:
+            self._listener.cancel()
+            self._listener = None
+        await self._pubsub.aclose()
+        await self._redis.aclose()
+    
+    async def _listen(self):
+        while True:
+            if not self._subscribers:
+                await asyncio.sleep(0.1)
+                continue
+            try:
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except Exception as e:
+                logger.warning(f"Redis relay read failed: {str(e)}")
+                await asyncio.sleep(1.0)
+                continue
+            if message is None:
+                continue
+            for callback in self._subscribers.get(message['channel'][len(self.prefix):], []):
+                try:
+                    await callback(message['data'])
+                except Exception as e:
+                    logger.warning(f"State event delivery failed: {str(e)}")
+    
+    async def get(self, key: str) -> Optional[str]:
+        return await self._redis.get(self.prefix + key)
+    
+    async def set(self, key: str, value: str, ttl: Optional[float] = None):
+        await self._redis.set(self.prefix + key, value, px=int(ttl * 1000) if ttl else None)
+    
+    async def set_if_absent(self, key: str, value: str, ttl: float) -> bool:
+        return bool(await self._redis.set(self.prefix + key, value, px=int(ttl * 1000), nx=True))
+    
+    async def delete_if_equals(self, key: str, value: str):
+        await self._redis.eval(self.RELEASE_SCRIPT, 1, self.prefix + key, value)
+    
+    async def publish(self, channel: str, payload: str):
+        await self._redis.publish(self.prefix + channel, payload)
+    
+    async def subscribe(self, channel: str, callback):
+        if channel not in self._subscribers:
+            await self._pubsub.subscribe(self.prefix + channel)
+        self._subscribers.setdefault(channel, []).append(callback)
+
+def create_state_backend(url: str) -> SharedStateBackend:
+    """Build the backend named by STATE_BACKEND: memory, sqlite:///path, redis://host or unix:///path/redis.sock"""
+    if url in ('', 'memory'):
+        return InProcessStateBackend()
+    if url.startswith('sqlite:///'):
+        return SQLiteStateBackend(url[len('sqlite:///'):])
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisStateBackend(url)
+    raise ValueError(f"Unsupported STATE_BACKEND '{url}', expected memory, sqlite:///path or redis://host")
+
+state_backend = create_state_backend(os.getenv("STATE_BACKEND", "memory"))
+logger.info(f"✅ Shared state backend: {state_backend.name}")
+
+# Request Coalescing
+def canonical_request_hash(requirements: ProjectRequirements, roster_hash: str) -> str:
+    """Hash of an optimization request that ignores personnel and skill ordering.
+
+    roster_hash comes from RunHistoryStore.compute_roster_hash, which callers run off the event loop.
+    """
+    canonical_requirements = json.dumps(
+        {**requirements.dict(), 'skills': sorted(requirements.skills)},
+        sort_keys=True, separators=(',', ':'), default=str
+    )
+    return hashlib.sha256(f"{canonical_requirements}|{roster_hash}".encode('utf-8')).hexdigest()
+
+class SingleFlightGroup:
+    """Coalesces concurrent calls with the same key onto one in-flight task.
+
+    With a shared state backend the key is also claimed across workers: followers on other
+    workers poll for the leader's outcome instead of starting their own job.
+    """
+    
+    def __init__(self, calls_per_job: int = 4, state: Optional[SharedStateBackend] = None,
+                 lock_ttl: float = 600.0, poll_interval: float = 0.25):
+        self.calls_per_job = calls_per_job  # LLM phases avoided per coalesced request
+        self.state = state
+        self.lock_ttl = lock_ttl
+        self.poll_interval = poll_interval
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.jobs_started = 0
+        self.requests_coalesced = 0
+        self.requests_coalesced_remote = 0
+    
+    async def do(self, key: str, job_factory) -> tuple:
+        """Await the shared job for key, starting it if needed; returns (result, coalesced)"""
+        task = self._inflight.get(key)
+        coalesced = task is not None
+        if coalesced:
+            self.requests_coalesced += 1
+        else:
+            if self.state is not None and self.state.shared:
+                task = asyncio.ensure_future(self._run_shared(key, job_factory))
+            else:
+                task = asyncio.ensure_future(self._run_local(job_factory))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so one disconnecting caller cannot cancel the job for everyone else
+        result, remote = await asyncio.shield(task)
+        return result, coalesced or remote
+    
+    async def _run_local(self, job_factory) -> tuple:
+        self.jobs_started += 1
+        return await job_factory(), False
+    
+    async def _run_shared(self, key: str, job_factory) -> tuple:
+        """Lead the job across workers, or follow the worker that already leads it"""
+        lock_key = f"flight:{key}"
+        token = uuid.uuid4().hex
+        followed = False
+        while True:
+            if await self.state.set_if_absent(lock_key, token, self.lock_ttl):
+                self.jobs_started += 1
+                outcome = {'error': 'Coalesced optimization was cancelled'}
+                try:
+                    result = await job_factory()
+                    outcome = {'result': result}
+                    return result, False
+                except Exception as e:
+                    outcome = {'error': e.detail if isinstance(e, HTTPException) else str(e)}
+                    raise
+                finally:
+                    # Publish the outcome before releasing so followers never miss it
+                    await self.state.set(f"flight-outcome:{token}", json.dumps(outcome, default=str), self.lock_ttl)
+                    await self.state.delete_if_equals(lock_key, token)
+            
+            leader = await self.state.get(lock_key)
+            if leader is None:
+                continue
+            if not followed:
+                followed = True
+                self.requests_coalesced_remote += 1
+            outcome = await self._await_leader(lock_key, leader)
+            if outcome is None:
+                # The leader went away without an outcome; claim the job ourselves
+                continue
+            if 'error' in outcome:
+                raise HTTPException(status_code=500, detail=outcome['error'])
+            return outcome['result'], True
+    
+    async def _await_leader(self, lock_key: str, leader: str) -> Optional[Dict[str, Any]]:
+        outcome_key = f"flight-outcome:{leader}"
+        while True:
+            raw = await self.state.get(outcome_key)
+            if raw is not None:
+                return json.loads(raw)
+            if await self.state.get(lock_key) != leader:
+                raw = await self.state.get(outcome_key)
+                return json.loads(raw) if raw is not None else None
+            await asyncio.sleep(self.poll_interval)
+    
+    def stats(self) -> Dict[str, int]:
+        coalesced = self.requests_coalesced + self.requests_coalesced_remote
+        return {
+            'jobsStarted': self.jobs_started,
+            'requestsCoalesced': self.requests_coalesced,
+            'requestsCoalescedRemote': self.requests_coalesced_remote,
+            'llmCallsSaved': coalesced * self.calls_per_job,
+            'inFlight': len(self._inflight)
+        }
+
+# Request Profiling
+ACTIVE_PROFILER: contextvars.ContextVar = contextvars.ContextVar('active_profiler', default=None)
+
+class RequestProfiler:
+    """cProfile capture of one optimization request with an event-loop stall breakdown.
+
+    Only the event loop thread is profiled; LLM calls in worker threads are timed, not profiled,
+    since Python 3.12+ allows a single active cProfile per interpreter.
+    """
+    
+    # Only one cProfile may be active at a time
+    _loop_thread_lock = threading.Lock()
+    
+    def __init__(self, run_id: str, stall_threshold: float = 0.02, sample_interval: float = 0.005):
+        self.run_id = run_id
+        self.stall_threshold = stall_threshold
+        self.sample_interval = sample_interval
+        self.current_phase = 'orchestrator'
+        self.loop_profile = cProfile.Profile()
+        self.llm_calls: List[tuple] = []  # (phase, seconds)
+        self.stalls: Dict[str, Dict[str, float]] = {}
+        self.wall_seconds = 0.0
+        self._calls_lock = threading.Lock()
+    
+    def time_call(self, fn):
+        """Run fn in the current worker thread, recording its wall time against the current phase"""
+        phase = self.current_phase
+        started = time.perf_counter()
+        try:
+            return fn()
+        finally:
+            with self._calls_lock:
+                self.llm_calls.append((phase, time.perf_counter() - started))
+    
+    async def _monitor_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.sample_interval)
+            lag = loop.time() - started - self.sample_interval
+            if lag >= self.stall_threshold:
+                entry = self.stalls.setdefault(self.current_phase, {'count': 0, 'seconds': 0.0, 'maxSeconds': 0.0})
+                entry['count'] += 1
+                entry['seconds'] += lag
+                entry['maxSeconds'] = max(entry['maxSeconds'], lag)
+    
+    async def run(self, coroutine):
+        """Await coroutine with profiling active for its task context"""
+        if not self._loop_thread_lock.acquire(blocking=False):
+            coroutine.close()
+            raise HTTPException(status_code=409, detail="Another profiled request is already running")
+        token = ACTIVE_PROFILER.set(self)
+        monitor = asyncio.create_task(self._monitor_loop())
+        started = time.perf_counter()
+        self.loop_profile.enable()
+        try:
+            return await coroutine
+        finally:
+            self.loop_profile.disable()
+            self.wall_seconds = time.perf_counter() - started
+            monitor.cancel()
+            ACTIVE_PROFILER.reset(token)
+            self._loop_thread_lock.release()
+    
+    @staticmethod
+    def _top_functions(profile: cProfile.Profile, limit: int) -> List[Dict[str, Any]]:
+        stats = pstats.Stats(profile).stats
+        ranked = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+        return [
+            {
+                'function': f"{os.path.basename(filename)}:{line}({name})",
+                'calls': calls,
+                'totalSeconds': round(total_time, 6),
+                'cumulativeSeconds': round(cumulative_time, 6)
+            }
+            for (filename, line, name), (_, calls, total_time, cumulative_time, _) in ranked
+        ]
+    
+    def summary(self, limit: int = 25) -> Dict[str, Any]:
+        """JSON-friendly profile report; loop-thread data includes any concurrent loop work"""
+        return {
+            'runId': self.run_id,
+            'wallSeconds': round(self.wall_seconds, 4),
+            'eventLoop': {
+                'stallThresholdMs': self.stall_threshold * 1000,
+                'blockedSeconds': round(sum(entry['seconds'] for entry in self.stalls.values()), 4),
+                'byPhase': {
+                    phase: {key: round(value, 4) if isinstance(value, float) else value for key, value in entry.items()}
+                    for phase, entry in self.stalls.items()
+                }
+            },
+            'loopThread': self._top_functions(self.loop_profile, limit),
+            'llmCalls': [{'phase': phase, 'seconds': round(seconds, 4)} for phase, seconds in self.llm_calls]
+        }
+    
+    def save(self, directory: str) -> Dict[str, Any]:
+        """Write the JSON summary and the raw loop .prof dump for later inspection with pstats/snakeviz"""
+        os.makedirs(directory, exist_ok=True)
+        report = self.summary()
+        self.loop_profile.dump_stats(os.path.join(directory, f"{self.run_id}-loop.prof"))
+        with open(os.path.join(directory, f"{self.run_id}.json"), 'w') as f:
+            json.dump(report, f)
+        return report
+
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+def require_admin(token: Optional[str]):
+    """Gate admin-only features on the ADMIN_TOKEN environment variable"""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin features are disabled; set ADMIN_TOKEN to enable them")
+    if not token or not hmac.compare_digest(token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+# Personnel Store
+def person_from_row(row: tuple) -> Person:
+    """Build a Person from a validated compact row without re-running full validation"""
+    fields = dict(zip(ROW_FIELDS, row))
+    if fields['allocations']:
+        # Allocation dates still need parsing
+        return Person(**fields)
+    fields['skills'] = list(fields['skills'])
+    fields['allocations'] = []
+    return Person.model_construct(**fields)
+
+class PersonnelStore:
+    """Server-side roster in compact row tuples with name and skill indexes"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.rows: List[tuple] = []  # ingest.ROW_FIELDS layout
+        self.name_index: Dict[str, int] = {}
+        self.skill_index: Dict[str, set] = {}
+    
+    def __len__(self) -> int:
+        return len(self.rows)
+    
+    def upsert_rows(self, rows: List[tuple]) -> tuple:
+        """Insert or replace rows by name, keeping derived indexes in sync; returns (inserted, updated)"""
+        inserted = updated = 0
+        with self._lock:
+            for row in rows:
+                name, skills = row[1], row[2]
+                position = self.name_index.get(name)
+                if position is None:
+                    position = len(self.rows)
+                    self.rows.append(row)
+                    self.name_index[name] = position
+                    inserted += 1
+                else:
+                    for skill in self.rows[position][2]:
+                        self.skill_index[skill].discard(position)
+                    self.rows[position] = row
+                    updated += 1
+                for skill in skills:
+                    self.skill_index.setdefault(skill, set()).add(position)
+        return inserted, updated
+    
+    @staticmethod
+    def row_to_person(row: tuple) -> Person:
+        return person_from_row(row)
+    
+    def list_people(self, limit: int, offset: int, skill: Optional[str] = None) -> Dict[str, Any]:
+        """Paginated view of stored people, optionally restricted to one skill"""
+        with self._lock:
+            if skill is None:
+                positions = range(offset, min(offset + limit, len(self.rows)))
+                total = len(self.rows)
+            else:
+                matching = sorted(self.skill_index.get(skill, ()))
+                positions = matching[offset:offset + limit]
+                total = len(matching)
+            rows = [self.rows[position] for position in positions]
+        return {
+            'personnel': [self.row_to_person(row) for row in rows],
+            'total': total,
+            'limit': limit,
+            'offset': offset
+        }
+
+personnel_store = PersonnelStore()
+INGEST_SPOOL_BYTES = int(os.getenv("INGEST_SPOOL_BYTES", str(8 * 1024 * 1024)))
+INGEST_MAX_ERRORS = 100
+
+class StreamingRequestParser:
+    """Incremental parser for {"requirements": {...}, "personnel": [...]} request bodies.
+
+    People are validated one at a time and converted straight into the roster, so the raw
+    body and parsed dicts are never held in full; bad payloads fail on the first bad element.
+    """
+    
+    WHITESPACE = ' \t\r\n'
+    INTEGER_FIELDS = ('id', 'experienceYears')
+    NUMBER_FIELDS = ('hourlyRate',)
+    
+    def __init__(self, chunks, max_body_bytes: int, max_personnel: int, max_person_bytes: int):
+        self._chunks = chunks.__aiter__()
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json_decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+        self.max_body_bytes = max_body_bytes
+        self.max_personnel = max_personnel
+        self.max_person_bytes = max_person_bytes
+        self.bytes_read = 0
+        self.requirements: Optional[ProjectRequirements] = None
+        self.personnel: List[Person] = []
+    
+    async def _fill(self) -> bool:
+        """Append the next body chunk to the buffer; False once the body is exhausted"""
+        if self._eof:
+            return False
+        try:
+            chunk = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            self._eof = True
+            chunk = b''
+        self.bytes_read += len(chunk)
+        if self.bytes_read > self.max_body_bytes:
+            raise HTTPException(status_code=413, detail=f"Request body exceeds {self.max_body_bytes} bytes")
+        try:
+            text = self._text_decoder.decode(chunk, final=self._eof)
+        except UnicodeDecodeError:
+            raise HTTPException(status_code=400, detail="Request body is not valid UTF-8")
+        self._buffer = self._buffer[self._pos:] + text
+        self._pos = 0
+        return bool(text) or not self._eof
+    
+    async def _peek(self) -> str:
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in self.WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not await self._fill():
+                raise HTTPException(status_code=400, detail="Unexpected end of request body")
+    
+    async def _expect(self, char: str):
+        if await self._peek() != char:
+            raise HTTPException(status_code=400, detail=f"Expected '{char}' at byte {self.bytes_read - len(self._buffer) + self._pos}")
+        self._pos += 1
+    
+    async def _decode_value(self, max_bytes: int) -> Any:
+        await self._peek()
+        while True:
+            try:
+                value, end = self._json_decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as e:
+                if len(self._buffer) - self._pos > max_bytes:
+                    raise HTTPException(status_code=413, detail=f"JSON value exceeds {max_bytes} bytes")
+                if not await self._fill():
+                    raise HTTPException(status_code=400, detail=f"Invalid JSON: {e.msg}")
+                continue
+            # A number ending exactly at the buffer edge may continue in the next chunk
+            if isinstance(value, (int, float)) and end == len(self._buffer) and await self._fill():
+                continue
+            self._pos = end
+            return value
+    
+    @classmethod
+    def _check_json_types(cls, raw: Dict[str, Any]):
+        """Reject JSON values that validate_row coerces for CSV cells but /optimize-team would refuse"""
+        # validate_row also accepts CSV-style "Python;Go" strings; JSON bodies must send a list
+        if not isinstance(raw.get('skills'), list):
+            raise ValueError("skills must be a list of strings")
+        for field in cls.INTEGER_FIELDS + cls.NUMBER_FIELDS:
+            value = raw.get(field)
+            if isinstance(value, bool):
+                raise ValueError(f"{field} must be a number, not a boolean")
+            if field in cls.INTEGER_FIELDS and isinstance(value, float) and not value.is_integer():
+                raise ValueError(f"{field} must be an integer")
+    
+    async def _parse_personnel(self):
+        await self._expect('[')
+        if await self._peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            index = len(self.personnel)
+            if index >= self.max_personnel:
+                raise HTTPException(status_code=413, detail=f"Personnel list exceeds {self.max_personnel} people")
+            raw = await self._decode_value(self.max_person_bytes)
+            if not isinstance(raw, dict):
+                raise HTTPException(status_code=422, detail=f"personnel[{index}] must be an object")
+            try:
+                self._check_json_types(raw)
+                self.personnel.append(person_from_row(validate_row(raw)))
+            except ValueError as e:
+                raise HTTPException(status_code=422, detail=f"personnel[{index}]: {e}")
+            separator = await self._peek()
+            self._pos += 1
+            if separator == ']':
+                return
+            if separator != ',':
+                raise HTTPException(status_code=400, detail=f"Expected ',' or ']' after personnel[{index}]")
+    
+    async def parse(self) -> OptimizationRequest:
+        await self._expect('{')
+        if await self._peek() == '}':
+            self._pos += 1
+        else:
+            while True:
+                key = await self._decode_value(1024)
+                if not isinstance(key, str):
+                    raise HTTPException(status_code=400, detail="Object keys must be strings")
+                await self._expect(':')
+                if key == 'personnel':
+                    await self._parse_personnel()
+                elif key == 'requirements':
+                    try:
+                        self.requirements = ProjectRequirements(**await self._decode_value(self.max_person_bytes))
+                    except (TypeError, ValueError) as e:
+                        raise HTTPException(status_code=422, detail=f"requirements: {e}")
+                else:
+                    await self._decode_value(self.max_person_bytes)
+                separator = await self._peek()
+                self._pos += 1
+                if separator == '}':
+                    break
+                if separator != ',':
+                    raise HTTPException(status_code=400, detail="Expected ',' or '}' in request object")
+        
+        while self._pos == len(self._buffer) and await self._fill():
+            pass
+        if self._buffer[self._pos:].strip():
+            raise HTTPException(status_code=400, detail="Unexpected data after request object")
+        if self.requirements is None:
+            raise HTTPException(status_code=422, detail="requirements is required")
+        return OptimizationRequest.model_construct(requirements=self.requirements, personnel=self.personnel)
+
+STREAM_MAX_BODY_BYTES = int(os.getenv("STREAM_MAX_BODY_BYTES", str(256 * 1024 * 1024)))
+STREAM_MAX_PERSONNEL = int(os.getenv("STREAM_MAX_PERSONNEL", "100000"))
+STREAM_MAX_PERSON_BYTES = int(os.getenv("STREAM_MAX_PERSON_BYTES", str(64 * 1024)))
+
 # Main Orchestrator
 class Real4AgentOrchestrator:
     """Orchestrator for real 4-agent specialized system"""
     
-    def __init__(self, websocket_manager):
+    def __init__(self, websocket_manager, run_store: RunHistoryStore, state: Optional[SharedStateBackend] = None):
         self.websocket_manager = websocket_manager
-        self.agent_system = Real4AgentSystem(websocket_manager)
+        self.run_store = run_store
+        self.agent_system = Real4AgentSystem(websocket_manager, state)
+        self.single_flight = SingleFlightGroup(state=state)
+
+    async def optimize_team_formation_shared(self, requirements: ProjectRequirements,
+                                             personnel: List[Person]) -> tuple:
+        """Run optimization, attaching to an identical in-flight job when there is one.
+
+        Returns (run_id, result, coalesced). Attached callers share the leader's run id,
+        result and WebSocket progress events.
+        """
+        # Hashing a large roster takes long enough to stall the event loop
+        roster_hash = await asyncio.to_thread(RunHistoryStore.compute_roster_hash, personnel)
+        key = canonical_request_hash(requirements, roster_hash)
+        run_id = uuid.uuid4().hex
+        
+        async def run_job():
+            return run_id, await self.optimize_team_formation(requirements, personnel, run_id, roster_hash)
+        
+        (run_id, result), coalesced = await self.single_flight.do(key, run_job)
+        if coalesced:
+            logger.info(f"✅ Coalesced optimization request onto in-flight run {run_id}")
+        return run_id, result, coalesced
 
-    async def optimize_team_formation(self, requirements: ProjectRequirements, personnel: List[Person]) -> Dict[str, Any]:
+    async def optimize_team_formation(self, requirements: ProjectRequirements, personnel: List[Person],
+                                      run_id: Optional[str] = None, roster_hash: Optional[str] = None) -> Dict[str, Any]:
         """Execute real 4-agent team formation with sequential processing"""
         
+        run_id = run_id or uuid.uuid4().hex
+        await asyncio.to_thread(self.run_store.create_run, run_id, requirements, personnel, roster_hash)
+        
+        # Announce the run id first so reconnecting clients can fetch the stored result
+        await self.websocket_manager.broadcast({
+            "agent_type": "orchestrator",
+            "status": "running",
+            "progress": 0,
+            "message": "4-Agent specialized analysis started",
+            "run_id": run_id
+        })
+        
+        tracker = self.agent_system.create_tracker(run_id)
         try:
-            result = await self.agent_system.execute_sequential_analysis(requirements, personnel)
+            result, phase_outputs, timings = await self.agent_system.execute_sequential_analysis(
+                requirements, personnel, tracker
+            )
+            await asyncio.to_thread(self.run_store.complete_run, run_id, phase_outputs, result, timings)
+            await tracker.publish_job_status('completed', result=result)
             
             await self.websocket_manager.broadcast({
                 "agent_type": "orchestrator",
                 "status": "completed",
                 "progress": 100,
                 "message": "4-Agent specialized analysis complete",
+                "run_id": run_id,
                 "results": result
             })
             
@@ -860,14 +2756,21 @@ class Real4AgentOrchestrator:
             
         except Exception as e:
             logger.error(f"4-Agent optimization failed: {str(e)}")
+            await asyncio.to_thread(self.run_store.fail_run, run_id, str(e))
+            await tracker.publish_job_status('error', error=str(e))
             await self.websocket_manager.broadcast({
                 "agent_type": "orchestrator",
                 "status": "error", 
                 "progress": 0,
-                "message": f"4-Agent optimization failed: {str(e)}"
+                "message": f"4-Agent optimization failed: {str(e)}",
+                "run_id": run_id
             })
             raise HTTPException(status_code=500, detail=str(e))
 
+SWEEP_MAX_POINTS = int(os.getenv("SWEEP_MAX_POINTS", "1000"))
+roster_snapshots = RosterSnapshotStore(os.getenv("SNAPSHOT_DIR", "snapshots"),
+                                       int(os.getenv("SNAPSHOT_MAX_ROSTERS", "32")))
+
 # Global orchestrator instance
 real_4agent_orchestrator = None
 
@@ -876,12 +2779,21 @@ async def startup_event():
     """Initialize the real 4-agent orchestrator on startup"""
     global real_4agent_orchestrator
     try:
-        real_4agent_orchestrator = Real4AgentOrchestrator(manager)
+        await state_backend.start()
+        await state_backend.subscribe(PROGRESS_CHANNEL, manager.deliver)
+        manager.relay = state_backend
+        real_4agent_orchestrator = Real4AgentOrchestrator(manager, run_store, state_backend)
         logger.info("✅ Real 4-Agent Team Formation Optimizer started successfully")
     except Exception as e:
         logger.error(f"Failed to initialize real 4-agent orchestrator: {str(e)}")
         raise
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop relaying progress events through the shared state backend"""
+    manager.relay = None
+    await state_backend.close()
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for real-time updates"""
@@ -893,13 +2805,17 @@ async def websocket_endpoint(websocket: WebSocket):
         manager.disconnect(websocket)
 
 @app.post("/optimize-team")
-async def optimize_team(request: OptimizationRequest):
+async def optimize_team(request: OptimizationRequest, profile: bool = False,
+                        x_admin_token: Optional[str] = Header(None)):
     """Main endpoint for real 4-agent team optimization"""
     global real_4agent_orchestrator
     
     if not real_4agent_orchestrator:
         raise HTTPException(status_code=500, detail="Real 4-Agent Orchestrator not initialized")
     
+    if profile:
+        require_admin(x_admin_token)
+    
     try:
         if not request.personnel:
             raise HTTPException(status_code=400, detail="Personnel list cannot be empty")
@@ -907,22 +2823,239 @@ async def optimize_team(request: OptimizationRequest):
         if request.requirements.teamSize > len(request.personnel):
             raise HTTPException(status_code=400, detail="Team size cannot exceed available personnel")
         
-        # Execute real 4-agent optimization
-        result = await real_4agent_orchestrator.optimize_team_formation(
+        if profile:
+            # Profiled runs never coalesce so the profile reflects this request's own work
+            run_id = uuid.uuid4().hex
+            profiler = RequestProfiler(run_id)
+            result = await profiler.run(real_4agent_orchestrator.optimize_team_formation(
+                request.requirements, request.personnel, run_id
+            ))
+            report = await asyncio.to_thread(profiler.save, PROFILE_DIR)
+            return {
+                "status": "success",
+                "run_id": run_id,
+                "coalesced": False,
+                "data": result,
+                "profile": report,
+                "message": "Real 4-Agent specialized optimization completed successfully"
+            }
+        
+        # Execute real 4-agent optimization, sharing identical in-flight jobs
+        run_id, result, coalesced = await real_4agent_orchestrator.optimize_team_formation_shared(
             request.requirements, 
             request.personnel
         )
         
         return {
             "status": "success",
+            "run_id": run_id,
+            "coalesced": coalesced,
             "data": result,
             "message": "Real 4-Agent specialized optimization completed successfully"
         }
         
     except Exception as e:
+        if isinstance(e, HTTPException) and e.status_code == 409:
+            raise
         logger.error(f"Real 4-Agent optimization endpoint error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/optimize-team/stream")
+async def optimize_team_stream(request: Request):
+    """Team optimization for very large personnel payloads, parsed incrementally"""
+    if not real_4agent_orchestrator:
+        raise HTTPException(status_code=500, detail="Real 4-Agent Orchestrator not initialized")
+    
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > STREAM_MAX_BODY_BYTES:
+        raise HTTPException(status_code=413, detail=f"Request body exceeds {STREAM_MAX_BODY_BYTES} bytes")
+    
+    parser = StreamingRequestParser(request.stream(), STREAM_MAX_BODY_BYTES, STREAM_MAX_PERSONNEL, STREAM_MAX_PERSON_BYTES)
+    parsed = await parser.parse()
+    
+    if not parsed.personnel:
+        raise HTTPException(status_code=400, detail="Personnel list cannot be empty")
+    if parsed.requirements.teamSize > len(parsed.personnel):
+        raise HTTPException(status_code=400, detail="Team size cannot exceed available personnel")
+    
+    try:
+        run_id, result, coalesced = await real_4agent_orchestrator.optimize_team_formation_shared(
+            parsed.requirements,
+            parsed.personnel
+        )
+        
+        return {
+            "status": "success",
+            "run_id": run_id,
+            "coalesced": coalesced,
+            "data": result,
+            "message": "Real 4-Agent specialized optimization completed successfully"
+        }
+        
+    except Exception as e:
+        logger.error(f"Streaming optimization endpoint error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/optimize-team/sweep")
+async def optimize_team_sweep(request: SweepRequest):
+    """Deterministic what-if sweep over team size, budget caps and objective weights"""
+    if not request.personnel:
+        raise HTTPException(status_code=400, detail="Personnel list cannot be empty")
+    
+    team_sizes = request.teamSizes or [request.requirements.teamSize]
+    if any(size < 1 or size > len(request.personnel) for size in team_sizes):
+        raise HTTPException(status_code=400, detail="Team sizes must be between 1 and the available personnel")
+    
+    grid_points = len(team_sizes) * len(request.budgetCaps) * len(request.weights)
+    if grid_points > SWEEP_MAX_POINTS:
+        raise HTTPException(status_code=400, detail=f"Sweep grid has {grid_points} points, limit is {SWEEP_MAX_POINTS}")
+    
+    def run_sweep():
+        started = time.perf_counter()
+        window = CapacityCalendar.project_window(request.requirements)
+        available = None
+        if window:
+            free_capacity = CapacityCalendar(request.personnel).free_capacity(*window)
+            available = np.array(free_capacity) >= request.requirements.requiredAllocation
+        features, source, order = roster_snapshots.get_or_build(request.personnel, MBTICompatibilityEngine)
+        if available is not None:
+            available = available[order]
+        engine = TeamSweepEngine(features, [request.personnel[i].name for i in order], request.requirements.skills,
+                                 available)
+        table = engine.sweep(team_sizes, request.budgetCaps, [w.dict() for w in request.weights])
+        table['featuresSource'] = source
+        table['elapsedMs'] = round((time.perf_counter() - started) * 1000, 2)
+        return table
+    
+    return {
+        "status": "success",
+        "data": await asyncio.to_thread(run_sweep)
+    }
+
+@app.post("/capacity/availability")
+async def capacity_availability(query: CapacityQuery):
+    """Find people with enough free capacity and the given skills in a date window"""
+    def run_query():
+        calendar = CapacityCalendar(query.personnel)
+        return calendar.query(query.startDate, query.endDate, query.minFreeCapacity, query.skills)
+    
+    available = await asyncio.to_thread(run_query)
+    return {
+        "status": "success",
+        "data": {"available": available, "total": len(available)}
+    }
+
+@app.post("/personnel/ingest")
+async def ingest_personnel(request: Request, fmt: str = Query("jsonl", alias="format"), replace: bool = False,
+                           chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """Stream a CSV, JSONL or Parquet roster body into the personnel store"""
+    if fmt not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(FORMATS)}")
+    if chunk_size < 1:
+        raise HTTPException(status_code=400, detail="chunk_size must be positive")
+    
+    global personnel_store
+    # Replacing parses into a fresh store so a failed upload leaves the current roster intact
+    target = PersonnelStore() if replace else personnel_store
+    
+    # Spool the body so memory stays flat; large uploads roll over to disk
+    with tempfile.SpooledTemporaryFile(max_size=INGEST_SPOOL_BYTES) as spool:
+        async for body_chunk in request.stream():
+            if spool.tell() + len(body_chunk) > INGEST_SPOOL_BYTES:
+                # Disk writes (including the rollover itself) stay off the event loop
+                await asyncio.to_thread(spool.write, body_chunk)
+            else:
+                spool.write(body_chunk)
+        spool.seek(0)
+        
+        def run_ingest():
+            started = time.perf_counter()
+            stats = {'rowsRead': 0, 'inserted': 0, 'updated': 0, 'errorCount': 0, 'errors': []}
+            for rows, errors in iter_validated_chunks(spool, fmt, chunk_size):
+                inserted, updated = target.upsert_rows(rows)
+                stats['rowsRead'] += len(rows) + len(errors)
+                stats['inserted'] += inserted
+                stats['updated'] += updated
+                stats['errorCount'] += len(errors)
+                remaining = INGEST_MAX_ERRORS - len(stats['errors'])
+                stats['errors'].extend({'row': row, 'error': message} for row, message in errors[:remaining])
+            elapsed = time.perf_counter() - started
+            stats['elapsedMs'] = round(elapsed * 1000, 2)
+            stats['rowsPerSecond'] = round(stats['rowsRead'] / elapsed) if elapsed else None
+            stats['rosterSize'] = len(target)
+            return stats
+        
+        try:
+            stats = await asyncio.to_thread(run_ingest)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    if replace:
+        personnel_store = target
+    
+    logger.info(f"✅ Ingested {stats['inserted'] + stats['updated']} people ({stats['errorCount']} errors)")
+    return {
+        "status": "success",
+        "data": stats
+    }
+
+@app.get("/personnel")
+async def list_personnel(limit: int = 50, offset: int = 0, skill: Optional[str] = None):
+    """Page through the stored roster"""
+    if limit < 1 or limit > 1000:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 1000")
+    if offset < 0:
+        raise HTTPException(status_code=400, detail="offset cannot be negative")
+    
+    return personnel_store.list_people(limit, offset, skill)
+
+@app.get("/runs")
+async def list_runs(limit: int = 20, offset: int = 0, roster_hash: Optional[str] = None):
+    """List stored optimization runs, newest first"""
+    if limit < 1 or limit > 100:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 100")
+    if offset < 0:
+        raise HTTPException(status_code=400, detail="offset cannot be negative")
+    
+    return await asyncio.to_thread(run_store.list_runs, limit, offset, roster_hash)
+
+@app.get("/runs/{run_id}")
+async def get_run(run_id: str, include_phases: bool = False):
+    """Fetch a stored optimization run by id"""
+    run = await asyncio.to_thread(run_store.get_run, run_id, include_phases)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Run {run_id} not found")
+    return run
+
+@app.get("/runs/{run_id}/status")
+async def get_run_status(run_id: str):
+    """Live per-agent status of a run, served by any worker"""
+    status = await state_backend.get_job(run_id)
+    if status is None:
+        run = await asyncio.to_thread(run_store.get_run, run_id, False)
+        if run is None:
+            raise HTTPException(status_code=404, detail=f"Run {run_id} not found")
+        status = {'runId': run_id, 'status': run['status'], 'result': run['result'], 'error': run['error']}
+    return {"status": "success", "data": status}
+
+@app.get("/runs/{run_id}/profile")
+async def get_run_profile(run_id: str, x_admin_token: Optional[str] = Header(None)):
+    """Fetch the stored profile report of a profiled run"""
+    require_admin(x_admin_token)
+    path = os.path.join(PROFILE_DIR, f"{os.path.basename(run_id)}.json")
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail=f"No profile stored for run {run_id}")
+    with open(path) as f:
+        return json.load(f)
+
+@app.get("/runs/{run_id}/diff/{other_run_id}")
+async def diff_runs(run_id: str, other_run_id: str):
+    """Diff two stored optimization runs"""
+    diff = await asyncio.to_thread(run_store.diff_runs, run_id, other_run_id)
+    if diff is None:
+        raise HTTPException(status_code=404, detail="One or both runs not found")
+    return diff
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -933,6 +3066,9 @@ async def health_check():
         "agents": 4,
         "specialization": "True Sequential Processing",
         "mbti_enabled": True,
+        "coalescing": real_4agent_orchestrator.single_flight.stats() if real_4agent_orchestrator else None,
+        "modelRouting": model_router.stats(),
+        "stateBackend": state_backend.name,
         "timestamp": datetime.now().isoformat(),
         "version": "3.0.0"
     }
@@ -955,7 +3091,8 @@ async def root():
             "Sequential agent processing",
             "MBTI personality integration", 
             "True agent specialization",
-            "Real-time progress tracking"
+            "Real-time progress tracking",
+            "Persistent run history"
         ],
         "docs": "/docs"
     }
@@ -0,0 +1,82 @@
+import asyncio
+import os
+import sys
+import tempfile
+from typing import Any, Dict, List
+
+# Point every on-disk store at a scratch directory before main is imported
+SCRATCH_DIR = tempfile.mkdtemp(prefix="teamforge-tests-")
+os.environ.setdefault("GOOGLE_API_KEY", "test-key")
+os.environ["RUN_STORE_PATH"] = os.path.join(SCRATCH_DIR, "runs.db")
+os.environ["SNAPSHOT_DIR"] = os.path.join(SCRATCH_DIR, "snapshots")
+os.environ["PROFILE_DIR"] = os.path.join(SCRATCH_DIR, "profiles")
+os.environ.pop("STATE_BACKEND", None)
+os.environ.pop("MODEL_ROUTING", None)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from loadtest import FAKE_LLM_REPLY
+
+PHASES = ['hrSkillsAnalyst', 'psychologyExpert', 'techArchitect', 'executiveStrategist']
+
+
+def make_people(prefix: str = "P", count: int = 8) -> List[Dict[str, Any]]:
+    return [
+        {
+            "name": f"{prefix} {i}",
+            "skills": ["Python", "React", "AWS", "Java"][: 1 + i % 4],
+            "experience": ["junior", "mid", "senior", "lead"][i % 4],
+            "personality": ["leadership", "analytical", "creative", "collaborative"][i % 4],
+            "experienceYears": 1 + i,
+            "hourlyRate": 50.0 + i
+        }
+        for i in range(count)
+    ]
+
+
+def make_requirements(name: str = "Project", team_size: int = 3, **extra) -> Dict[str, Any]:
+    return {"projectName": name, "teamSize": team_size, "skills": ["Python", "React"],
+            "projectType": "web", "priority": "high", "timeline": "6", **extra}
+
+
+class FakeModels:
+    """Offline stand-in for routed model calls with scripted replies and latencies"""
+
+    def __init__(self):
+        self.replies: Dict[str, List[str]] = {}  # phase -> replies served in order, then FAKE_LLM_REPLY
+        self.latency: Dict[str, float] = {}  # model name -> seconds
+        self.delay = None  # optional callable(phase, spec, task) -> seconds
+        self.calls: List[tuple] = []  # (phase, model name)
+
+    async def invoke(self, phase, spec, task) -> str:
+        self.calls.append((phase, spec.name))
+        delay = self.delay(phase, spec, task) if self.delay else self.latency.get(spec.name, 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+        queue = self.replies.get(phase)
+        return queue.pop(0) if queue else FAKE_LLM_REPLY
+
+
+@pytest.fixture
+def fake_models(monkeypatch):
+    fake = FakeModels()
+
+    async def invoke_model(self, phase, spec, task):
+        return await fake.invoke(phase, spec, task)
+
+    monkeypatch.setattr(main.Real4AgentSystem, "_invoke_model", invoke_model)
+    return fake
+
+
+@pytest.fixture
+def orchestrator(fake_models):
+    return main.Real4AgentOrchestrator(main.manager, main.run_store)
+
+
+@pytest.fixture
+def client(fake_models):
+    with TestClient(main.app) as test_client:
+        yield test_client
@@ -0,0 +1,57 @@
+import random
+from datetime import date
+
+import pytest
+from pydantic import ValidationError
+
+import main
+from conftest import make_people
+
+
+def test_interval_index_matches_brute_force():
+    rng = random.Random(5)
+    intervals = []
+    for owner in range(200):
+        start = rng.randint(0, 1000)
+        intervals.append((start, start + rng.randint(0, 60), owner, 0.5))
+    index = main.AllocationIntervalIndex(intervals)
+
+    for _ in range(200):
+        start = rng.randint(-20, 1060)
+        end = start + rng.randint(0, 80)
+        found = sorted(index.owners[pos] for pos in index.overlapping(start, end))
+        expected = sorted(owner for s, e, owner, _ in intervals if s <= end and e >= start)
+        assert found == expected
+
+
+def test_peak_allocation_counts_only_concurrent_overlap():
+    person = main.Person(**make_people(count=1)[0], allocations=[
+        {"projectName": "A", "startDate": "2026-01-01", "endDate": "2026-01-31", "fraction": 0.5},
+        {"projectName": "B", "startDate": "2026-01-20", "endDate": "2026-02-10", "fraction": 0.3},
+        # Starts the day after A ends, so it never stacks on A
+        {"projectName": "C", "startDate": "2026-02-01", "endDate": "2026-02-28", "fraction": 0.4}
+    ])
+    calendar = main.CapacityCalendar([person])
+
+    assert calendar.peak_allocations(date(2026, 1, 1), date(2026, 3, 31)) == {0: pytest.approx(0.8)}
+    assert calendar.peak_allocations(date(2026, 2, 11), date(2026, 3, 31)) == {0: pytest.approx(0.4)}
+    assert calendar.peak_allocations(date(2026, 3, 1), date(2026, 3, 31)) == {}
+    assert calendar.free_capacity(date(2026, 2, 1), date(2026, 2, 5)) == [pytest.approx(0.3)]
+
+
+def test_reversed_dates_and_out_of_range_fractions_are_rejected(client):
+    with pytest.raises(ValidationError):
+        main.Allocation(projectName="A", startDate="2026-02-01", endDate="2026-01-01")
+    with pytest.raises(ValidationError):
+        main.Allocation(projectName="A", startDate="2026-01-01", endDate="2026-02-01", fraction=1.5)
+
+    response = client.post("/capacity/availability", json={
+        "personnel": make_people(), "startDate": "2026-03-01", "endDate": "2026-02-01"
+    })
+    assert response.status_code == 422
+    response = client.post("/optimize-team", json={
+        "requirements": {"projectName": "X", "teamSize": 2, "skills": ["Python"], "projectType": "web",
+                         "priority": "high", "requiredAllocation": 2},
+        "personnel": make_people()
+    })
+    assert response.status_code == 422
@@ -0,0 +1,84 @@
+import asyncio
+import threading
+
+import pytest
+
+import main
+from conftest import make_people, make_requirements
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_one_job_per_key():
+    group = main.SingleFlightGroup()
+    started = []
+
+    def job(value):
+        async def run():
+            started.append(value)
+            await asyncio.sleep(0.05)
+            return value
+        return run
+
+    results = await asyncio.gather(group.do("a", job("a")), group.do("a", job("a")), group.do("b", job("b")))
+
+    assert results == [("a", False), ("a", True), ("b", False)]
+    assert started == ["a", "b"]
+    assert group.jobs_started == 2
+    assert group.requests_coalesced == 1
+
+
+@pytest.mark.asyncio
+async def test_single_flight_propagates_errors_and_releases_key():
+    group = main.SingleFlightGroup()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    outcomes = await asyncio.gather(group.do("a", fail), group.do("a", fail), return_exceptions=True)
+    assert all(isinstance(outcome, ValueError) for outcome in outcomes)
+
+    async def succeed():
+        return "ok"
+
+    assert await group.do("a", succeed) == ("ok", False)
+
+
+@pytest.mark.asyncio
+async def test_identical_requests_coalesce_onto_one_run(fake_models, orchestrator):
+    fake_models.delay = lambda phase, spec, task: 0.05
+    people = [main.Person(**p) for p in make_people()]
+
+    def request(name):
+        return orchestrator.optimize_team_formation_shared(main.ProjectRequirements(**make_requirements(name)), people)
+
+    (first_id, first, first_coalesced), (second_id, second, second_coalesced), (other_id, _, other_coalesced) = (
+        await asyncio.gather(request("Alpha"), request("Alpha"), request("Beta"))
+    )
+
+    assert first_id == second_id != other_id
+    assert first == second
+    # Either identical request may lead, depending on which roster hash finishes first
+    assert sorted([first_coalesced, second_coalesced]) == [False, True] and not other_coalesced
+    assert orchestrator.single_flight.jobs_started == 2
+    assert len(fake_models.calls) == 2 * len(main.PHASE_ORDER)
+
+
+@pytest.mark.asyncio
+async def test_roster_is_hashed_once_off_the_event_loop(fake_models, orchestrator, monkeypatch):
+    compute = main.RunHistoryStore.compute_roster_hash
+    threads = []
+
+    def tracked(personnel):
+        threads.append(threading.current_thread())
+        return compute(personnel)
+
+    monkeypatch.setattr(main.RunHistoryStore, "compute_roster_hash", staticmethod(tracked))
+    people = [main.Person(**p) for p in make_people()]
+
+    run_id, _, _ = await orchestrator.optimize_team_formation_shared(
+        main.ProjectRequirements(**make_requirements()), people
+    )
+
+    assert len(threads) == 1 and threads[0] is not threading.current_thread()
+    assert main.run_store.get_run(run_id)['rosterHash'] == compute(people)
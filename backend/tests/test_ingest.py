@@ -0,0 +1,61 @@
+import io
+import json
+from datetime import date
+
+import pyarrow
+import pyarrow.parquet as pq
+import pytest
+
+from conftest import make_people
+from ingest import validate_row
+
+
+def jsonl(rows):
+    return "\n".join(json.dumps(row) for row in rows).encode()
+
+
+def test_validate_row_checks_allocation_entries():
+    person = make_people(count=1)[0]
+    row = validate_row({**person, "allocations": [
+        {"projectName": "A", "startDate": "2026-01-01", "endDate": "2026-02-01", "fraction": 0.5}
+    ]})
+    assert row[-1] == ({'projectName': 'A', 'startDate': date(2026, 1, 1), 'endDate': date(2026, 2, 1), 'fraction': 0.5},)
+
+    for allocation, message in [
+        ({"foo": 1}, "projectName is required"),
+        ({"projectName": "A", "startDate": "soon", "endDate": "2026-02-01"}, "ISO date"),
+        ({"projectName": "A", "startDate": "2026-03-01", "endDate": "2026-02-01"}, "before startDate"),
+        ({"projectName": "A", "startDate": "2026-01-01", "endDate": "2026-02-01", "fraction": "half"}, "number"),
+        ({"projectName": "A", "startDate": "2026-01-01", "endDate": "2026-02-01", "fraction": 1.5}, "between 0 and 1")
+    ]:
+        with pytest.raises(ValueError, match=message):
+            validate_row({**person, "allocations": [allocation]})
+
+
+def test_bad_allocations_are_row_errors_and_the_roster_stays_readable(client):
+    people = make_people(count=3)
+    people[1]["allocations"] = [{"foo": 1}]
+    response = client.post("/personnel/ingest", params={"format": "jsonl", "replace": "true"}, content=jsonl(people))
+
+    stats = response.json()["data"]
+    assert stats["inserted"] == 2
+    assert stats["errors"] == [{"row": 2, "error": "allocation projectName is required"}]
+    assert client.get("/personnel").status_code == 200
+
+
+def test_failed_replace_keeps_the_current_roster(client):
+    client.post("/personnel/ingest", params={"format": "jsonl", "replace": "true"}, content=jsonl(make_people(count=4)))
+
+    response = client.post("/personnel/ingest", params={"format": "parquet", "replace": "true"}, content=b"not parquet")
+    assert response.status_code == 400
+    assert client.get("/personnel").json()["total"] == 4
+
+
+def test_parquet_roster_is_ingested(client):
+    buffer = io.BytesIO()
+    pq.write_table(pyarrow.Table.from_pylist(make_people(count=5)), buffer)
+    response = client.post("/personnel/ingest", params={"format": "parquet", "replace": "true"},
+                           content=buffer.getvalue())
+
+    assert response.json()["data"]["inserted"] == 5
+    assert client.get("/personnel").json()["total"] == 5
@@ -0,0 +1,75 @@
+import random
+import re
+from collections import Counter
+
+import pytest
+
+import main
+from conftest import make_people
+
+ENGINE = main.MBTICompatibilityEngine
+MBTI_TYPES = sorted(ENGINE.get_mbti_compatibility_matrix())
+
+
+def pool(seed: int, count: int):
+    rng = random.Random(seed)
+    people = []
+    for person in make_people("Pool", count):
+        # Leave some people on the personality mapping so both MBTI sources are covered
+        mbti = rng.choice(MBTI_TYPES) if rng.random() < 0.8 else None
+        people.append(main.Person(**{**person, "mbtiType": mbti,
+                                     "personality": rng.choice(["leadership", "analytical", "creative",
+                                                                "collaborative", "detail-oriented", "innovative"])}))
+    return people
+
+
+def conflict_counts(conflicts):
+    counts = Counter()
+    for conflict in conflicts:
+        mbti1, mbti2 = re.findall(r"\(([A-Z]{4})\)", conflict)
+        counts[tuple(sorted((mbti1, mbti2)))] += 1
+    return counts
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_histogram_matches_pairwise_conflicts(seed):
+    people = pool(seed, 60)
+    histogram = ENGINE.conflict_histogram(people)
+    conflicts = ENGINE.identify_potential_conflicts(people)
+
+    assert histogram['totalConflictPairs'] == len(conflicts)
+    assert {tuple(entry['types']): entry['pairs'] for entry in histogram['conflictPairs']} == conflict_counts(conflicts)
+    assert histogram['totalPairs'] == 60 * 59 // 2
+    assert sum(histogram['typeCounts'].values()) == 60
+
+
+def test_same_type_pairs_count_against_higher_thresholds():
+    people = pool(7, 40)
+    labels = [p.mbtiType or ENGINE.personality_to_mbti(p.personality) for p in people]
+    # Same-type pairs score the 0.7 default, so a 0.75 threshold flags them too
+    expected = Counter(
+        tuple(sorted((labels[i], labels[j])))
+        for i in range(len(people)) for j in range(i + 1, len(people))
+        if ENGINE.pair_compatibility(labels[i], labels[j]) < 0.75
+    )
+    histogram = ENGINE.conflict_histogram(people, threshold=0.75)
+
+    assert {tuple(entry['types']): entry['pairs'] for entry in histogram['conflictPairs']} == expected
+    assert any(mbti1 == mbti2 for mbti1, mbti2 in expected)
+    assert histogram['totalConflictPairs'] == sum(expected.values())
+
+
+def test_team_risks_build_pair_detail_only_for_the_selected_team():
+    system = main.Real4AgentSystem(main.manager)
+    people = make_people("Team", 4)
+    team = [main.Person(**{**person, "mbtiType": mbti}) for person, mbti in zip(people, ["ENFP", "ISTJ", "INTJ", "ENFP"])]
+    outsider_risk = {'a': "Team 0", 'b': "Someone Else", 'level': 'high', 'reason': "Outside the team"}
+
+    risks = system._get_comprehensive_risks(1, team, {'pair_risks': [outsider_risk]}, {})
+    assert risks == ENGINE.identify_potential_conflicts(team)[:2]
+    assert risks == ["Team 0 (ENFP) and Team 1 (ISTJ) may have communication challenges",
+                     "Team 1 (ISTJ) and Team 3 (ENFP) may have communication challenges"]
+
+    flagged = {'a': "Team 0", 'b': "Team 2", 'level': 'medium', 'reason': "Competing priorities"}
+    risks = system._get_comprehensive_risks(1, team, {'pair_risks': [outsider_risk, flagged]}, {})
+    assert risks == ["Team 0 and Team 2: Competing priorities"]
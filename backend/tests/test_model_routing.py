@@ -0,0 +1,99 @@
+import threading
+import time
+
+import pytest
+
+import main
+from conftest import FAKE_LLM_REPLY, PHASES, make_people, make_requirements
+
+
+def routed_system(phases, pro_latency=0.3, flash_latency=0.05, run_deadline=None, budget=1.0):
+    config = main.ModelRoutingConfig(
+        models=[
+            main.ModelSpec(name='pro', model='gemini/gemini-1.5-pro', expectedLatency=pro_latency),
+            main.ModelSpec(name='flash', model='gemini/gemini-1.5-flash', expectedLatency=flash_latency)
+        ],
+        phases={phase: main.PhaseRoute(models=['pro', 'flash'], latencyBudget=budget) for phase in phases},
+        runDeadline=run_deadline
+    )
+    return main.Real4AgentSystem(main.manager, router=main.ModelRouter(config))
+
+
+async def analyse(system) -> tuple:
+    """Run all phases and return (final result, structured output status and model per phase)"""
+    result, _, _ = await system.execute_sequential_analysis(main.ProjectRequirements(**make_requirements()),
+                                                            [main.Person(**p) for p in make_people()])
+    return result, result['metadata']['structuredOutputs'], result['metadata']['modelRouting']
+
+
+@pytest.mark.asyncio
+async def test_timeout_falls_back_to_the_next_model(fake_models):
+    system = routed_system(['hrSkillsAnalyst'])
+    fake_models.latency = {'pro': 5.0}
+
+    started = time.perf_counter()
+    _, statuses, models = await analyse(system)
+
+    assert time.perf_counter() - started < 1.5
+    assert fake_models.calls == [('hrSkillsAnalyst', 'pro'), ('hrSkillsAnalyst', 'flash')]
+    assert (models['hrSkillsAnalyst'], statuses['hrSkillsAnalyst']) == ('flash', 'parsed')
+    assert system.router.stats()['models']['pro']['failures'] == 1
+    # Phases without a route go straight to their deterministic path
+    assert statuses['psychologyExpert'] == 'deterministic'
+
+
+@pytest.mark.asyncio
+async def test_phase_goes_deterministic_when_no_model_fits(fake_models):
+    system = routed_system(PHASES, budget=0.01)
+
+    result, statuses, _ = await analyse(system)
+
+    assert fake_models.calls == []
+    assert set(statuses.values()) == {'deterministic'}
+    assert result['recommendations']
+
+
+@pytest.mark.asyncio
+async def test_run_deadline_steers_phases_to_faster_models(fake_models):
+    _, _, models = await analyse(routed_system(PHASES, pro_latency=0.8, flash_latency=0.1))
+    assert set(models.values()) == {'pro'}
+
+    fake_models.calls.clear()
+    _, _, models = await analyse(routed_system(PHASES, pro_latency=0.8, flash_latency=0.1, run_deadline=0.7))
+    assert set(models.values()) == {'flash'}
+    assert {model for _, model in fake_models.calls} == {'flash'}
+
+
+@pytest.mark.asyncio
+async def test_each_attempt_runs_its_own_task_on_the_llm_executor(monkeypatch):
+    system = routed_system(['hrSkillsAnalyst'])
+    pro_agent = system._agents[('hrSkillsAnalyst', 'pro')]
+    # Build the fallback agent up front so its construction does not count against the call timeout
+    system._agents[('hrSkillsAnalyst', 'flash')] = system.agent_factories['hrSkillsAnalyst'](
+        system.router.llm_for(system.router.specs['flash'])
+    )
+    kickoffs = []
+
+    class FakeCrew:
+        def __init__(self, agents, tasks, verbose=False):
+            self.agent, self.task = agents[0], tasks[0]
+
+        def kickoff(self):
+            kickoffs.append((self.task, self.agent, threading.current_thread().name))
+            if self.agent is pro_agent:
+                time.sleep(1.2)
+            return FAKE_LLM_REPLY
+
+    monkeypatch.setattr(main, "Crew", FakeCrew)
+    template = main.Task(description="Score the roster", expected_output="JSON")
+    usage = {'started': time.perf_counter(), 'cost': 0.0}
+
+    _, spec = await system._kickoff_routed('hrSkillsAnalyst', template, usage)
+
+    assert spec.name == 'flash'
+    (first_task, first_agent, first_thread), (second_task, second_agent, second_thread) = kickoffs
+    assert first_agent is pro_agent and second_agent is not pro_agent
+    assert first_task is not second_task and template not in (first_task, second_task)
+    assert template.agent is None and first_task.agent is first_agent and second_task.agent is second_agent
+    assert first_task.description == second_task.description == template.description
+    assert first_thread.startswith("llm") and second_thread.startswith("llm")
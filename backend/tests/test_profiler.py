@@ -0,0 +1,37 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+import main
+
+
+@pytest.mark.asyncio
+async def test_llm_calls_are_timed_under_the_loop_profile(tmp_path):
+    profiler = main.RequestProfiler("run-1")
+
+    async def request():
+        profiler.current_phase = 'hrSkillsAnalyst'
+        return await asyncio.to_thread(profiler.time_call, lambda: sum(range(10000)))
+
+    assert await profiler.run(request()) == sum(range(10000))
+
+    report = profiler.save(str(tmp_path))
+    assert [call['phase'] for call in report['llmCalls']] == ['hrSkillsAnalyst']
+    assert report['loopThread']
+    assert sorted(os.listdir(tmp_path)) == ["run-1-loop.prof", "run-1.json"]
+    with open(tmp_path / "run-1.json") as f:
+        assert json.load(f) == report
+
+
+@pytest.mark.asyncio
+async def test_profiled_requests_do_not_overlap():
+    first, second = main.RequestProfiler("a"), main.RequestProfiler("b")
+    running = asyncio.create_task(first.run(asyncio.sleep(0.05)))
+    await asyncio.sleep(0)
+
+    with pytest.raises(main.HTTPException) as error:
+        await second.run(asyncio.sleep(0))
+    assert error.value.status_code == 409
+    await running
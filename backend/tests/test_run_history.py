@@ -0,0 +1,37 @@
+import asyncio
+import uuid
+
+import pytest
+
+import main
+from conftest import make_people, make_requirements
+
+
+@pytest.mark.asyncio
+async def test_concurrent_runs_store_their_own_outputs_and_timings(fake_models, orchestrator):
+    fake_models.delay = lambda phase, spec, task: 0.2 if 'Alpha' in task.description else 0.0
+    alpha_id, beta_id = uuid.uuid4().hex, uuid.uuid4().hex
+
+    await asyncio.gather(
+        orchestrator.optimize_team_formation(main.ProjectRequirements(**make_requirements("Alpha")),
+                                             [main.Person(**p) for p in make_people("Alpha")], alpha_id),
+        orchestrator.optimize_team_formation(main.ProjectRequirements(**make_requirements("Beta")),
+                                             [main.Person(**p) for p in make_people("Beta")], beta_id)
+    )
+
+    alpha = main.run_store.get_run(alpha_id)
+    beta = main.run_store.get_run(beta_id)
+    assert all(seconds >= 0.2 for seconds in alpha['timings'].values())
+    assert all(seconds < 0.2 for seconds in beta['timings'].values())
+    assert all(name.startswith("Alpha") for name in alpha['phases']['hrSkillsAnalyst']['personnel_scores'])
+    assert all(name.startswith("Beta") for name in beta['phases']['hrSkillsAnalyst']['personnel_scores'])
+
+
+def test_diff_reports_changed_requirements(client):
+    people = make_people()
+    first = client.post("/optimize-team", json={"requirements": make_requirements(team_size=3), "personnel": people}).json()
+    second = client.post("/optimize-team", json={"requirements": make_requirements(team_size=4), "personnel": people}).json()
+
+    diff = client.get(f"/runs/{first['run_id']}/diff/{second['run_id']}").json()
+    assert diff['sameRoster'] is True
+    assert diff['requirementsChanges'] == {'teamSize': {'a': 3, 'b': 4}}
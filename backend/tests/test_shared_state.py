@@ -0,0 +1,73 @@
+import asyncio
+import uuid
+
+import pytest
+
+import main
+from conftest import make_people, make_requirements
+
+
+def test_backends_must_implement_the_state_interface():
+    with pytest.raises(TypeError):
+        main.SharedStateBackend()
+
+    class Partial(main.SharedStateBackend):
+        async def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_runs_publish_their_own_job_status(fake_models):
+    state = main.InProcessStateBackend()
+    orchestrator = main.Real4AgentOrchestrator(main.manager, main.run_store, state)
+    fake_models.delay = lambda phase, spec, task: 0.1 if 'Alpha' in task.description else 0.0
+    alpha_id, beta_id = uuid.uuid4().hex, uuid.uuid4().hex
+
+    def run(name, run_id):
+        return orchestrator.optimize_team_formation(main.ProjectRequirements(**make_requirements(name)),
+                                                    [main.Person(**p) for p in make_people(name)], run_id)
+
+    alpha = asyncio.create_task(run("Alpha", alpha_id))
+    await run("Beta", beta_id)
+    beta_status = await state.get_job(beta_id)
+    alpha_status = await state.get_job(alpha_id)
+    assert beta_status['status'] == 'completed'
+    assert alpha_status['status'] == 'running'
+    assert alpha_status['agents']['executiveStrategist']['status'] == 'ready'
+
+    alpha_result = await alpha
+    for run_id in (alpha_id, beta_id):
+        status = await state.get_job(run_id)
+        assert status['status'] == 'completed'
+        assert {agent['status'] for agent in status['agents'].values()} == {'completed'}
+    assert (await state.get_job(alpha_id))['result'] == alpha_result
+    assert (await state.get_job(beta_id))['result'] != alpha_result
+
+
+@pytest.mark.asyncio
+async def test_single_flight_coalesces_across_workers_on_sqlite(tmp_path):
+    path = str(tmp_path / "state.db")
+    backends = [main.SQLiteStateBackend(path), main.SQLiteStateBackend(path)]
+    for backend in backends:
+        await backend.start()
+    groups = [main.SingleFlightGroup(state=backend, poll_interval=0.01) for backend in backends]
+    started = []
+
+    async def job():
+        started.append(1)
+        await asyncio.sleep(0.1)
+        return {'team': ['P 0', 'P 1']}
+
+    try:
+        results = await asyncio.gather(groups[0].do("key", job), groups[1].do("key", job))
+    finally:
+        for backend in backends:
+            await backend.close()
+
+    assert len(started) == 1
+    assert [result for result, _ in results] == [{'team': ['P 0', 'P 1']}] * 2
+    assert sorted(coalesced for _, coalesced in results) == [False, True]
+    assert sum(group.requests_coalesced_remote for group in groups) == 1
@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+import main
+from conftest import make_people, make_requirements
+
+
+async def chunked(body: bytes, size: int = 7):
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+
+async def parse(payload, max_body_bytes=1 << 20, max_personnel=100, max_person_bytes=4096):
+    body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+    parser = main.StreamingRequestParser(chunked(body), max_body_bytes, max_personnel, max_person_bytes)
+    return await parser.parse()
+
+
+async def rejected(payload, **limits) -> tuple:
+    with pytest.raises(main.HTTPException) as error:
+        await parse(payload, **limits)
+    return error.value.status_code, error.value.detail
+
+
+@pytest.mark.asyncio
+async def test_parses_small_chunks_into_validated_request():
+    people = make_people(count=5)
+    request = await parse({"extra": {"ignored": [1, 2]}, "personnel": people, "requirements": make_requirements()})
+
+    assert [p.name for p in request.personnel] == [p["name"] for p in people]
+    assert request.personnel[3].skills == people[3]["skills"]
+    assert request.requirements.projectName == "Project"
+
+
+@pytest.mark.asyncio
+async def test_enforces_size_limits():
+    payload = {"requirements": make_requirements(), "personnel": make_people(count=5)}
+    size = len(json.dumps(payload).encode())
+
+    assert (await rejected(payload, max_body_bytes=size - 1))[0] == 413
+    assert await rejected(payload, max_personnel=4) == (413, "Personnel list exceeds 4 people")
+    assert await rejected(payload, max_person_bytes=50) == (413, "JSON value exceeds 50 bytes")
+    assert len((await parse(payload, max_body_bytes=size, max_personnel=5)).personnel) == 5
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("person, detail", [
+    ("P 0", "personnel[1] must be an object"),
+    ({**make_people()[0], "skills": "Python;Go"}, "personnel[1]: skills must be a list of strings"),
+    ({**make_people()[0], "skills": ["Python", 3]}, "personnel[1]: skills must be strings"),
+    ({**make_people()[0], "hourlyRate": "cheap"}, None),
+    ({**make_people()[0], "experienceYears": 5.7}, "personnel[1]: experienceYears must be an integer"),
+    ({**make_people()[0], "experienceYears": True}, "personnel[1]: experienceYears must be a number, not a boolean"),
+    ({**make_people()[0], "id": 2.5}, "personnel[1]: id must be an integer"),
+    ({**make_people()[0], "hourlyRate": False}, "personnel[1]: hourlyRate must be a number, not a boolean"),
+])
+async def test_rejects_bad_personnel_elements(person, detail):
+    status, message = await rejected({"requirements": make_requirements(), "personnel": [make_people()[0], person]})
+
+    assert status == 422
+    assert message.startswith("personnel[1]")
+    if detail:
+        assert message == detail
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("body, status", [
+    (b'{"requirements": {}, "personnel": []}', 422),
+    (b'{"personnel": []}', 422),
+    (b'{"personnel": [] "requirements": {}}', 400),
+    (b'{"personnel": []} trailing', 400),
+    (b'{"personnel": [', 400),
+    (b'{"personnel": []}\xff', 400),
+])
+async def test_rejects_malformed_bodies(body, status):
+    assert (await rejected(body))[0] == status
+
+
+@pytest.mark.asyncio
+async def test_integral_floats_are_accepted_like_the_json_endpoint():
+    person = {**make_people()[0], "experienceYears": 5.0, "id": 7}
+    request = await parse({"requirements": make_requirements(team_size=1), "personnel": [person]})
+
+    assert (request.personnel[0].experienceYears, request.personnel[0].id) == (5, 7)
+    assert main.Person(**person).experienceYears == 5
+
+
+def test_stream_endpoint_rejects_string_skills(client):
+    person = {**make_people()[0], "skills": "Python;Go"}
+    response = client.post("/optimize-team/stream",
+                           content=json.dumps({"requirements": make_requirements(team_size=1), "personnel": [person]}))
+
+    assert response.status_code == 422
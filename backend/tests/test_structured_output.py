@@ -0,0 +1,29 @@
+import json
+
+import pytest
+
+import main
+from conftest import make_people, make_requirements
+
+
+def test_parse_phase_output_accepts_fenced_json_and_rejects_prose():
+    parsed = main.parse_phase_output('```json\n{"feasibility": 0.7, "risks": ["scope"]}\n```', main.TechnicalPhaseOutput)
+    assert parsed.feasibility == 0.7 and parsed.risks == ["scope"]
+    with pytest.raises(ValueError):
+        main.parse_phase_output("The team looks great.", main.TechnicalPhaseOutput)
+
+
+def test_malformed_reply_gets_one_repair_then_falls_back(client, fake_models):
+    fake_models.replies = {
+        'hrSkillsAnalyst': ["not json", json.dumps({"scores": {"P 1": {"Python": 9}}, "gaps": []})],
+        'techArchitect': ["still prose", "more prose"]
+    }
+    response = client.post("/optimize-team", json={"requirements": make_requirements(), "personnel": make_people()})
+
+    outputs = response.json()["data"]["metadata"]["structuredOutputs"]
+    assert outputs == {'hrSkillsAnalyst': 'repaired', 'psychologyExpert': 'parsed',
+                       'techArchitect': 'fallback', 'executiveStrategist': 'parsed'}
+    # One original call plus one repair for each malformed phase, nothing more
+    assert [phase for phase, _ in fake_models.calls].count('hrSkillsAnalyst') == 2
+    assert [phase for phase, _ in fake_models.calls].count('techArchitect') == 2
+    assert len(fake_models.calls) == 6
@@ -0,0 +1,138 @@
+import os
+import time
+
+import numpy as np
+
+import main
+from conftest import make_people, make_requirements
+
+
+def build_engine(rates, skills=None, available=None):
+    people = [
+        main.Person(name=f"P{i}", skills=(skills or [["Python"]] * len(rates))[i], experience="senior",
+                    personality="analytical", experienceYears=5, hourlyRate=rate)
+        for i, rate in enumerate(rates)
+    ]
+    features = main.RosterFeatures.build(people, main.MBTICompatibilityEngine)
+    return main.TeamSweepEngine(features, [p.name for p in people], ["Python"],
+                                None if available is None else np.array(available))
+
+
+def test_affordable_reserves_room_for_the_cheapest_remaining_slots():
+    engine = build_engine([10.0, 20.0, 30.0, 100.0])
+    selected = np.zeros(4, dtype=bool)
+
+    assert engine._affordable(selected, 1, 2, 0.0, 40.0).tolist() == [True, True, True, False]
+    # Picking the cheapest person frees the next-cheapest for the last slot
+    assert engine._affordable(selected, 1, 2, 0.0, 30.0).tolist() == [True, True, False, False]
+    assert not engine._affordable(selected, 1, 2, 0.0, 29.0).any()
+
+
+def test_affordable_lookahead_ignores_unavailable_people():
+    # The cheapest person is fully booked, so the last slot costs at least 20
+    engine = build_engine([1.0, 20.0, 21.0, 40.0], available=[False, True, True, True])
+    selected = np.zeros(4, dtype=bool)
+
+    assert engine._affordable(selected, 1, 2, 0.0, 45.0).tolist() == [True, True, True, False]
+    table = engine.sweep([2], [45.0], [main.SweepWeights().dict()])
+    row = dict(zip(table['columns'], table['rows'][0]))
+    assert row['feasible'] and sorted(row['members']) == ["P1", "P2"] and row['cost'] == 41.0
+
+
+def test_sweep_never_exceeds_budget_and_flags_infeasible_points():
+    engine = build_engine([10.0, 20.0, 30.0, 100.0],
+                          skills=[["Python"], ["Python"], ["Python"], ["Python", "React", "AWS", "Go"]])
+    table = engine.sweep([2, 3], [None, 60.0, 25.0], [main.SweepWeights().dict()])
+    rows = [dict(zip(table['columns'], row)) for row in table['rows']]
+
+    for row in rows:
+        if row['budgetCap'] is None:
+            assert row['feasible'] and 'P3' in row['members']
+        elif row['budgetCap'] == 60.0:
+            assert row['feasible'] and row['cost'] <= 60.0 and 'P3' not in row['members']
+        else:
+            assert not row['feasible'] and row['members'] == []
+
+
+def test_sweep_endpoint_rejects_oversized_grids(client, monkeypatch):
+    monkeypatch.setattr(main, "SWEEP_MAX_POINTS", 2)
+    response = client.post("/optimize-team/sweep", json={
+        "requirements": make_requirements(), "personnel": make_people(), "teamSizes": [2, 3, 4]
+    })
+    assert response.status_code == 400
+
+
+def test_reordered_roster_reuses_snapshot_with_its_own_rows(client):
+    people = [
+        {**person, "hourlyRate": rate}
+        for person, rate in zip(make_people("Reorder", count=6), [15.0, 60.0, 20.0, 45.0, 25.0, 30.0])
+    ]
+    # The cheapest person is fully booked during the project window
+    people[0]["allocations"] = [{"projectName": "Busy", "startDate": "2026-01-01", "endDate": "2026-12-31",
+                                 "fraction": 1.0}]
+    rates = {person["name"]: person["hourlyRate"] for person in people}
+    requirements = make_requirements(team_size=3, startDate="2026-03-01", endDate="2026-03-31")
+
+    tables = []
+    for roster in (people, people[::-1]):
+        response = client.post("/optimize-team/sweep", json={
+            "requirements": requirements, "personnel": roster, "budgetCaps": [100.0]
+        })
+        assert response.status_code == 200
+        tables.append(response.json()['data'])
+
+    assert tables[1]['featuresSource'] == 'memory'
+    forward, reverse = [dict(zip(table['columns'], table['rows'][0])) for table in tables]
+    for row in (forward, reverse):
+        assert row['feasible']
+        assert "Reorder 0" not in row['members']
+        assert row['cost'] == sum(rates[name] for name in row['members']) <= 100.0
+    assert sorted(forward['members']) == sorted(reverse['members'])
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def test_snapshot_hits_cost_less_than_a_build(tmp_path):
+    people = [main.Person(**p) for p in make_people("Bench", 20000)]
+    store = main.RosterSnapshotStore(str(tmp_path))
+
+    _, build_seconds = timed(lambda: main.RosterFeatures.build(people, main.MBTICompatibilityEngine))
+    assert store.get_or_build(people, main.MBTICompatibilityEngine)[1] == 'built'
+    (_, memory_source, _), memory_seconds = timed(lambda: store.get_or_build(people, main.MBTICompatibilityEngine))
+    fresh_worker = main.RosterSnapshotStore(str(tmp_path))
+    (_, disk_source, _), disk_seconds = timed(lambda: fresh_worker.get_or_build(people[::-1], main.MBTICompatibilityEngine))
+
+    assert (memory_source, disk_source) == ('memory', 'disk')
+    assert memory_seconds < build_seconds and disk_seconds < build_seconds
+
+
+def test_snapshot_evicted_mid_load_is_a_miss(tmp_path):
+    people = [main.Person(**p) for p in make_people()]
+    main.RosterSnapshotStore(str(tmp_path)).get_or_build(people, main.MBTICompatibilityEngine)
+    snapshot = next(entry.path for entry in os.scandir(tmp_path / "v1"))
+    # Another worker removed the arrays after this one could have read the manifest
+    os.remove(os.path.join(snapshot, "skill_bits.npy"))
+
+    store = main.RosterSnapshotStore(str(tmp_path))
+    assert store.load(os.path.basename(snapshot)) is None
+    assert store.get_or_build(people, main.MBTICompatibilityEngine)[1] == 'built'
+
+
+def test_snapshot_eviction_keeps_recently_used_rosters(tmp_path):
+    store = main.RosterSnapshotStore(str(tmp_path), max_rosters=2, memory_slots=0)
+    rosters = [[main.Person(**p) for p in make_people(prefix, 3 + i)] for i, prefix in enumerate("ABC")]
+    for roster in rosters[:2]:
+        store.get_or_build(roster, main.MBTICompatibilityEngine)
+        time.sleep(0.02)
+    # Reusing the first roster makes the second the least recently used
+    assert store.get_or_build(rosters[0], main.MBTICompatibilityEngine)[1] == 'disk'
+    time.sleep(0.02)
+    store.get_or_build(rosters[2], main.MBTICompatibilityEngine)
+
+    # Disk hits never evict, so check the kept rosters before rebuilding the evicted one
+    assert [store.get_or_build(roster, main.MBTICompatibilityEngine)[1] for roster in rosters[::2]] == ['disk', 'disk']
+    assert store.get_or_build(rosters[1], main.MBTICompatibilityEngine)[1] == 'built'